@@ -7,5 +7,8 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 Copyright (c) COLONOLNUTTY
 """
 from Utilities.compiler import compile_module
+from settings import compile_cache_folder
 
-compile_module(root='..\\Release\\Sims4ModSettingsMenu', mod_scripts_folder='.', include_folders=('sims4modsettingsmenu',), mod_name='sims4modsettingsmenu')
+
+if __name__ == '__main__':
+    compile_module(root='..\\Release\\Sims4ModSettingsMenu', mod_scripts_folder='.', include_folders=('sims4modsettingsmenu',), mod_name='sims4modsettingsmenu', release=True, cache_folder=compile_cache_folder)
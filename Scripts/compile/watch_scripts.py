@@ -0,0 +1,14 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+from Utilities.compiler import watch_module
+from settings import compile_cache_folder
+
+
+if __name__ == '__main__':
+    watch_module(root='..\\Release\\Sims4ModSettingsMenu', mod_scripts_folder='.', include_folders=('sims4modsettingsmenu',), mod_name='sims4modsettingsmenu', cache_folder=compile_cache_folder)
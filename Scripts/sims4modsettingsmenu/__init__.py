@@ -6,3 +6,8 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) COLONOLNUTTY
 """
+import os
+
+if os.environ.get('S4MSM_PROFILE_IMPORTS'):
+    from sims4modsettingsmenu.profiling.import_profiler import S4MSMImportProfiler
+    S4MSMImportProfiler.start()
@@ -0,0 +1,25 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+import sims4.commands
+from sims4modsettingsmenu.profiling.import_profile_report import write_import_profile
+from sims4modsettingsmenu.profiling.import_profiler import S4MSMImportProfiler
+
+
+@sims4.commands.Command('s4msm.write_import_profile', command_type=sims4.commands.CommandType.Live)
+def _s4msm_write_import_profile(_connection: int = None):
+    output = sims4.commands.CheatOutput(_connection)
+    if not S4MSMImportProfiler.get_records():
+        output('No imports have been recorded. Set the environment variable S4MSM_PROFILE_IMPORTS before starting the game to record them.')
+        return
+    try:
+        file_path = write_import_profile()
+    except Exception as ex:
+        output(f'Failed to write the import profile: {ex}')
+        return
+    output(f'Wrote the import profile to \'{file_path}\'.')
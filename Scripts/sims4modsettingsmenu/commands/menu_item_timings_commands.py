@@ -0,0 +1,72 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+import csv
+import os
+from typing import Tuple, List
+
+import sims4.commands
+from sims4communitylib.utils.common_log_utils import CommonLogUtils
+from sims4modsettingsmenu.registration.menu_item_statistics import S4MSMMenuItemStatistics
+from sims4modsettingsmenu.registration.mod_settings_menu_item import S4MSMMenuItem
+from sims4modsettingsmenu.registration.mod_settings_registry import S4MSMModSettingsRegistry
+
+_TIMINGS_HEADERS: Tuple[str] = ('identifier', 'tests', 'available', 'total_test_ms', 'average_test_ms', 'max_test_ms', 'shows', 'total_show_ms', 'average_show_ms', 'max_show_ms')
+_TIMINGS_FILE_NAME = 's4msm_menu_item_timings.csv'
+
+
+def _get_ranked_timings() -> List[Tuple[S4MSMMenuItem, S4MSMMenuItemStatistics]]:
+    # The menu items that cost the most overall come first.
+    return sorted(S4MSMModSettingsRegistry().get_all_menu_item_statistics(), key=lambda entry: entry[1].total_time, reverse=True)
+
+
+def _to_timings_row(menu_item: S4MSMMenuItem, menu_item_statistics: S4MSMMenuItemStatistics) -> Tuple:
+    return (
+        menu_item.identifier,
+        menu_item_statistics.test_count,
+        menu_item_statistics.available_count,
+        round(menu_item_statistics.total_test_time * 1000, 3),
+        round(menu_item_statistics.average_test_time * 1000, 3),
+        round(menu_item_statistics.max_test_time * 1000, 3),
+        menu_item_statistics.show_count,
+        round(menu_item_statistics.total_show_time * 1000, 3),
+        round(menu_item_statistics.average_show_time * 1000, 3),
+        round(menu_item_statistics.max_show_time * 1000, 3)
+    )
+
+
+@sims4.commands.Command('s4msm.show_menu_item_timings', command_type=sims4.commands.CommandType.Live)
+def _s4msm_show_menu_item_timings(_connection: int = None):
+    output = sims4.commands.CheatOutput(_connection)
+    registry = S4MSMModSettingsRegistry()
+    if registry.collected_menu_item_count > 0:
+        output(f'{registry.collected_menu_item_count} garbage collected menu item(s) have been pruned from the registry.')
+    ranked_timings = _get_ranked_timings()
+    if not ranked_timings:
+        output('No menu items have been registered.')
+        return
+    output('Menu item timings, slowest first (times in milliseconds):')
+    output(' | '.join(_TIMINGS_HEADERS))
+    for (menu_item, menu_item_statistics) in ranked_timings:
+        output(' | '.join(str(value) for value in _to_timings_row(menu_item, menu_item_statistics)))
+
+
+@sims4.commands.Command('s4msm.export_menu_item_timings', command_type=sims4.commands.CommandType.Live)
+def _s4msm_export_menu_item_timings(_connection: int = None):
+    output = sims4.commands.CheatOutput(_connection)
+    file_path = os.path.join(CommonLogUtils.get_mod_logs_location_path(), _TIMINGS_FILE_NAME)
+    try:
+        with open(file_path, 'w', newline='') as timings_file:
+            timings_writer = csv.writer(timings_file)
+            timings_writer.writerow(_TIMINGS_HEADERS)
+            for (menu_item, menu_item_statistics) in _get_ranked_timings():
+                timings_writer.writerow(_to_timings_row(menu_item, menu_item_statistics))
+    except Exception as ex:
+        output(f'Failed to export menu item timings to \'{file_path}\': {ex}')
+        return
+    output(f'Exported menu item timings to \'{file_path}\'.')
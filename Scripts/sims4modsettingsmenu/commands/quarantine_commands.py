@@ -0,0 +1,29 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+import sims4.commands
+from sims4modsettingsmenu.registration.mod_settings_registry import S4MSMModSettingsRegistry
+
+
+@sims4.commands.Command('s4msm.show_quarantined_menu_items', command_type=sims4.commands.CommandType.Live)
+def _s4msm_show_quarantined_menu_items(_connection: int = None):
+    output = sims4.commands.CheatOutput(_connection)
+    quarantined_menu_items = S4MSMModSettingsRegistry().get_quarantined_menu_items()
+    if not quarantined_menu_items:
+        output('No menu items are quarantined.')
+        return
+    output('Quarantined menu items:')
+    for menu_item in quarantined_menu_items:
+        output(menu_item.identifier)
+
+
+@sims4.commands.Command('s4msm.release_quarantined_menu_items', command_type=sims4.commands.CommandType.Live)
+def _s4msm_release_quarantined_menu_items(identifier: str = None, _connection: int = None):
+    output = sims4.commands.CheatOutput(_connection)
+    released_count = S4MSMModSettingsRegistry().release_quarantined_menu_items(identifier=identifier)
+    output(f'Released {released_count} menu item(s) from quarantine.')
@@ -6,19 +6,26 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) COLONOLNUTTY
 """
-from typing import Any, Callable
+from typing import Any, Callable, Tuple
+from weakref import WeakKeyDictionary
 
+from protocolbuffers.Localization_pb2 import LocalizedString
 from sims.sim_info import SimInfo
 from sims4communitylib.dialogs.option_dialogs.common_choose_object_option_dialog import CommonChooseObjectOptionDialog
 from sims4communitylib.dialogs.option_dialogs.options.common_dialog_option_context import CommonDialogOptionContext
+from sims4communitylib.dialogs.option_dialogs.options.objects.common_dialog_action_option import \
+    CommonDialogActionOption
 from sims4communitylib.dialogs.option_dialogs.options.objects.common_dialog_select_option import \
     CommonDialogSelectOption
+from sims4communitylib.enums.strings_enum import CommonStringId
 from sims4communitylib.logging.has_log import HasLog
 from sims4communitylib.mod_support.mod_identity import CommonModIdentity
+from sims4communitylib.utils.common_icon_utils import CommonIconUtils
 from sims4communitylib.utils.localization.common_localization_utils import CommonLocalizationUtils
 from sims4communitylib.utils.localization.common_localized_string_separators import CommonLocalizedStringSeparator
 from sims4modsettingsmenu.enums.string_ids import S4MSMStringId
 from sims4modsettingsmenu.modinfo import ModInfo
+from sims4modsettingsmenu.registration.available_menu_items import S4MSMAvailableMenuItems
 from sims4modsettingsmenu.registration.mod_settings_menu_item import S4MSMMenuItem
 from sims4modsettingsmenu.registration.mod_settings_registry import S4MSMModSettingsRegistry
 
@@ -29,6 +36,13 @@ class S4ModSettingsMenu(HasLog):
     The dialog shown when the Open Mod Settings interaction is used.
 
     """
+    # The number of menu items shown per page.
+    _PER_PAGE: int = 25
+    # The number of menu items evaluated beyond the current page, to know if there is a next page.
+    _LOOK_AHEAD: int = 1
+    # Composed (title, description) strings per menu item, along with the values they were composed from.
+    _DISPLAY_STRINGS_CACHE: 'WeakKeyDictionary[S4MSMMenuItem, Tuple[Tuple[Any, ...], Tuple[LocalizedString, LocalizedString]]]' = WeakKeyDictionary()
+
     def __init__(self, on_close: Callable[[], None] = None) -> None:
         super().__init__()
         self._on_close = on_close
@@ -56,36 +70,59 @@ class S4ModSettingsMenu(HasLog):
         :param page: The page to open at. Default is 1.
         :type page: int, optional
         """
-        self.log.debug('Opening Mod Settings Menu.')
+        if self.log.enabled:
+            self.log.debug('Opening Mod Settings Menu.')
+        available_menu_items = self._menu_item_registry.create_available_menu_items(source_sim_info, target=target)
+        self._open_page(source_sim_info, target, page, available_menu_items)
 
+    def _open_page(self, source_sim_info: SimInfo, target: Any, page: int, available_menu_items: S4MSMAvailableMenuItems) -> None:
         def _reopen(*_, **__) -> None:
-            self.log.debug('Reopening MSM.')
-            self.open(source_sim_info, target=target, page=option_dialog.current_page)
+            if self.log.enabled:
+                self.log.debug('Reopening MSM.')
+            # Settings may have changed the availability of menu items, so start with fresh results.
+            self.open(source_sim_info, target=target, page=page)
 
         def _on_close(*_, **__) -> None:
-            self.log.debug('MSM closed.')
+            if self.log.enabled:
+                self.log.debug('MSM closed.')
             if self._on_close is not None:
                 self._on_close()
 
+        def _on_previous_page(*_, **__) -> None:
+            self._open_page(source_sim_info, target, page - 1, available_menu_items)
+
+        def _on_next_page(*_, **__) -> None:
+            self._open_page(source_sim_info, target, page + 1, available_menu_items)
+
+        def _on_load_more(*_, **__) -> None:
+            # Continue testing the remaining menu items with a fresh time budget.
+            self._open_page(source_sim_info, target, page, available_menu_items)
+
         option_dialog = CommonChooseObjectOptionDialog(
             S4MSMStringId.MOD_SETTINGS_MENU,
             S4MSMStringId.CHOOSE_SETTINGS_TO_MODIFY,
             on_close=_on_close,
-            mod_identity=self.mod_identity
+            mod_identity=self.mod_identity,
+            # The menu pages itself, so the dialog only ever has a single page.
+            per_page=self._PER_PAGE + 2
         )
 
-        available_menu_items = self._menu_item_registry.get_menu_items_available_for(source_sim_info, target=target)
-
-        sorted_available_menu_items = sorted(available_menu_items, key=lambda mi: mi.identifier)
+        (page_menu_items, has_next_page) = available_menu_items.get_page(page, self._PER_PAGE, look_ahead=self._LOOK_AHEAD)
+        if not page_menu_items and page > 1 and available_menu_items.is_exhausted:
+            # Fewer menu items may be available than when the page was requested, such as after settings were changed.
+            last_page = max(1, (available_menu_items.available_count + self._PER_PAGE - 1) // self._PER_PAGE)
+            if self.log.enabled:
+                self.log.debug(f'Page {page} has no menu items, showing page {last_page} instead.')
+            self._open_page(source_sim_info, target, last_page, available_menu_items)
+            return
 
         def _on_chosen(_: str, chosen_menu_item: S4MSMMenuItem):
-            return chosen_menu_item.show(source_sim_info, target=target, on_close=_reopen)
+            return self._menu_item_registry.show_menu_item(chosen_menu_item, source_sim_info, target=target, on_close=_reopen)
 
-        self.log.debug('Adding menu items.')
-        for menu_item in sorted_available_menu_items:
-            mod_name_and_version = CommonLocalizationUtils.combine_localized_strings((menu_item.mod_name, menu_item.mod_version), separator=CommonLocalizedStringSeparator.SPACE)
-            description = CommonLocalizationUtils.combine_localized_strings((menu_item.description, mod_name_and_version), separator=CommonLocalizedStringSeparator.SPACE_PARENTHESIS_SURROUNDED)
-            title = CommonLocalizationUtils.combine_localized_strings((menu_item.title, menu_item.mod_version), separator=CommonLocalizedStringSeparator.SPACE_PARENTHESIS_SURROUNDED)
+        if self.log.enabled:
+            self.log.debug('Adding menu items.')
+        for menu_item in page_menu_items:
+            (title, description) = self._get_display_strings(menu_item)
             option_dialog.add_option(
                 CommonDialogSelectOption(
                     menu_item.identifier,
@@ -101,11 +138,64 @@ class S4ModSettingsMenu(HasLog):
                 )
             )
 
+        if not has_next_page and not available_menu_items.is_exhausted:
+            if self.log.enabled:
+                self.log.debug('Ran out of time testing menu items, adding a placeholder for the rest.')
+            option_dialog.add_option(
+                CommonDialogActionOption(
+                    CommonDialogOptionContext(
+                        S4MSMStringId.LOADING_MORE_MENU_ITEMS,
+                        S4MSMStringId.SOME_MODS_ARE_STILL_BEING_CHECKED
+                    ),
+                    on_chosen=_on_load_more
+                )
+            )
+
         if not option_dialog.has_options():
-            self.log.debug(f'No menu items were available for \'{source_sim_info}\' and \'{target}\'.')
+            if self.log.enabled:
+                self.log.debug(f'No menu items were available for \'{source_sim_info}\' and \'{target}\'.')
             return
 
+        if page > 1:
+            option_dialog.add_option(
+                CommonDialogActionOption(
+                    CommonDialogOptionContext(
+                        CommonStringId.PREVIOUS,
+                        CommonStringId.GO_TO_THE_PREVIOUS_PAGE,
+                        icon=CommonIconUtils.load_arrow_left_icon()
+                    ),
+                    on_chosen=_on_previous_page
+                )
+            )
+
+        if has_next_page:
+            option_dialog.add_option(
+                CommonDialogActionOption(
+                    CommonDialogOptionContext(
+                        CommonStringId.NEXT,
+                        CommonStringId.GO_TO_THE_NEXT_PAGE,
+                        icon=CommonIconUtils.load_arrow_right_icon()
+                    ),
+                    on_chosen=_on_next_page
+                )
+            )
+
         option_dialog.show(
-            sim_info=source_sim_info,
-            page=page
+            sim_info=source_sim_info
         )
+
+    def _get_display_strings(self, menu_item: S4MSMMenuItem) -> Tuple[LocalizedString, LocalizedString]:
+        # Localized Strings are resolved by the game client, so the composed strings do not depend on the active locale.
+        source_values = (menu_item.title, menu_item.description, menu_item.mod_name, menu_item.mod_version)
+        cached_entry = self._DISPLAY_STRINGS_CACHE.get(menu_item, None)
+        if cached_entry is not None:
+            (cached_source_values, cached_display_strings) = cached_entry
+            if cached_source_values == source_values:
+                return cached_display_strings
+        (title, description, mod_name, mod_version) = source_values
+        mod_name_and_version = CommonLocalizationUtils.combine_localized_strings((mod_name, mod_version), separator=CommonLocalizedStringSeparator.SPACE)
+        composed_description = CommonLocalizationUtils.combine_localized_strings((description, mod_name_and_version), separator=CommonLocalizedStringSeparator.SPACE_PARENTHESIS_SURROUNDED)
+        composed_title = CommonLocalizationUtils.combine_localized_strings((title, mod_version), separator=CommonLocalizedStringSeparator.SPACE_PARENTHESIS_SURROUNDED)
+        display_strings = (composed_title, composed_description)
+        self._DISPLAY_STRINGS_CACHE[menu_item] = (source_values, display_strings)
+        return display_strings
@@ -0,0 +1,17 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+from sims4communitylib.enums.enumtypes.common_int_flags import CommonIntFlags
+
+
+class S4MSMMenuItemSourceType(CommonIntFlags):
+    """ The kinds of Source Sims a menu item may be available for. """
+    NONE = 0
+    HUMAN = 1
+    ANIMAL = 2
+    ALL = HUMAN | ANIMAL
@@ -0,0 +1,21 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+from sims4communitylib.enums.enumtypes.common_int_flags import CommonIntFlags
+
+
+class S4MSMMenuItemTargetType(CommonIntFlags):
+    """ The kinds of Targets a menu item may be available for. """
+    NONE = 0
+    SIM = 1
+    TERRAIN = 2
+    OCEAN = 4
+    SCRIPT_OBJECT = 8
+    # No Target or a Target that does not fit any of the other types.
+    OTHER = 16
+    ALL = SIM | TERRAIN | OCEAN | SCRIPT_OBJECT | OTHER
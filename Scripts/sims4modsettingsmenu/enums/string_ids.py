@@ -21,3 +21,6 @@ class S4MSMStringId(CommonInt):
     MOD_SETTINGS = 0x00AA216D
     # Tokens: {0.String} (Mod Name)
     ALL_SETTINGS_RELATED_TO_MOD = 0x25570B41
+
+    LOADING_MORE_MENU_ITEMS = 0x3B79DEE6
+    SOME_MODS_ARE_STILL_BEING_CHECKED = 0xE794FD5B
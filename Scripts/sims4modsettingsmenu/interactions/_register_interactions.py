@@ -15,19 +15,26 @@ from sims4communitylib.services.resources.common_instance_manager_modification_r
 from sims4communitylib.services.resources.modification_handlers.common_add_interactions_to_affordance_lists_handler import \
     CommonAddInteractionsToAffordanceListsModificationHandler
 from sims4modsettingsmenu.enums.interaction_ids import S4MSMInteractionId
+from sims4modsettingsmenu.interactions.script_object_filter import S4MSMScriptObjectFilter
 from sims4communitylib.services.interactions.interaction_registration_service import CommonInteractionRegistry, \
     CommonInteractionType, CommonScriptObjectInteractionHandler, CommonInteractionHandler
 
 
+# Resolved once, the handlers are asked for these every time an object is loaded.
+_S4MSM_INTERACTION_IDS: Tuple[int] = (
+    S4MSMInteractionId.OPEN_MOD_SETTINGS_MENU,
+)
+_S4MSM_AFFORDANCE_LIST_IDS: Tuple[int] = (
+    CommonAffordanceListId.DEBUG_AFFORDANCES,
+)
+
+
 @CommonInteractionRegistry.register_interaction_handler(CommonInteractionType.ON_TERRAIN_LOAD)
 class _S4MSMTerrainInteractionHandler(CommonInteractionHandler):
     # noinspection PyMissingOrEmptyDocstring
     @property
     def interactions_to_add(self) -> Tuple[int]:
-        result: Tuple[int] = (
-            S4MSMInteractionId.OPEN_MOD_SETTINGS_MENU,
-        )
-        return result
+        return _S4MSM_INTERACTION_IDS
 
 
 @CommonInteractionRegistry.register_interaction_handler(CommonInteractionType.ON_OCEAN_LOAD)
@@ -35,10 +42,7 @@ class _S4MSMOceanInteractionHandler(CommonInteractionHandler):
     # noinspection PyMissingOrEmptyDocstring
     @property
     def interactions_to_add(self) -> Tuple[int]:
-        result: Tuple[int] = (
-            S4MSMInteractionId.OPEN_MOD_SETTINGS_MENU,
-        )
-        return result
+        return _S4MSM_INTERACTION_IDS
 
 
 @CommonInteractionRegistry.register_interaction_handler(CommonInteractionType.ON_SCRIPT_OBJECT_LOAD)
@@ -46,14 +50,11 @@ class _S4MSMSimInteractionHandler(CommonScriptObjectInteractionHandler):
     # noinspection PyMissingOrEmptyDocstring
     @property
     def interactions_to_add(self) -> Tuple[int]:
-        result: Tuple[int] = (
-            S4MSMInteractionId.OPEN_MOD_SETTINGS_MENU,
-        )
-        return result
+        return _S4MSM_INTERACTION_IDS
 
     # noinspection PyMissingOrEmptyDocstring
     def should_add(self, script_object: ScriptObject, *args, **kwargs) -> bool:
-        return True
+        return S4MSMScriptObjectFilter().should_add(script_object)
 
 
 @CommonInstanceManagerModificationRegistry.register_modification_handler()
@@ -61,15 +62,9 @@ class _S4MSMAddToAffordanceWhitelist(CommonAddInteractionsToAffordanceListsModif
     # noinspection PyMissingOrEmptyDocstring
     @property
     def interaction_ids(self) -> Tuple[int]:
-        result: Tuple[int] = (
-            S4MSMInteractionId.OPEN_MOD_SETTINGS_MENU,
-        )
-        return result
+        return _S4MSM_INTERACTION_IDS
 
     # noinspection PyMissingOrEmptyDocstring
     @property
     def affordance_list_ids(self) -> Tuple[int]:
-        result: Tuple[int] = (
-            CommonAffordanceListId.DEBUG_AFFORDANCES,
-        )
-        return result
+        return _S4MSM_AFFORDANCE_LIST_IDS
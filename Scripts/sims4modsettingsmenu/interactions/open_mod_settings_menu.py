@@ -6,7 +6,7 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) COLONOLNUTTY
 """
-from typing import Any
+from typing import Any, Union
 
 from sims4communitylib.classes.testing.common_test_result import CommonTestResult
 from sims4modsettingsmenu.dialogs.mod_settings_menu_dialog import S4ModSettingsMenu
@@ -24,10 +24,8 @@ class S4MSMOpenModSettingsMenuInteraction(CommonImmediateSuperInteraction):
 
     Open the Mod Settings Menu.
     """
-
-    def __init__(self, *_, **__) -> None:
-        super().__init__(*_, **__)
-        self._mod_settings_menu = S4ModSettingsMenu()
+    # Shared by every interaction and created when one first runs, interactions that are only tested never create it.
+    _MOD_SETTINGS_MENU: Union[S4ModSettingsMenu, None] = None
 
     # noinspection PyMissingOrEmptyDocstring
     @classmethod
@@ -50,18 +48,36 @@ class S4MSMOpenModSettingsMenuInteraction(CommonImmediateSuperInteraction):
         """
         return S4MSMModSettingsRegistry()
 
+    @classmethod
+    def get_mod_settings_menu(cls) -> S4ModSettingsMenu:
+        """get_mod_settings_menu()
+
+        Retrieve the Mod Settings Menu shared by all Open Mod Settings interactions.
+
+        .. note:: The menu is created the first time this is called.
+
+        :return: The Mod Settings Menu.
+        :rtype: S4ModSettingsMenu
+        """
+        if cls._MOD_SETTINGS_MENU is None:
+            S4MSMOpenModSettingsMenuInteraction._MOD_SETTINGS_MENU = S4ModSettingsMenu()
+        return cls._MOD_SETTINGS_MENU
+
     # noinspection PyMissingOrEmptyDocstring
     @classmethod
     def on_test(cls, interaction_sim: Sim, interaction_target: Any, interaction_context: InteractionContext, *args, **kwargs) -> CommonTestResult:
         source_sim_info = CommonSimUtils.get_sim_info(interaction_sim)
+        log = cls.get_log()
         if not cls.get_mod_settings_registry().has_menu_items_available_for(source_sim_info, target=interaction_target):
-            cls.get_log().debug('No menu items were available for \'{}\''.format(interaction_target))
+            if log.enabled:
+                log.debug('No menu items were available for \'{}\''.format(interaction_target))
             return cls.create_test_result(False)
-        cls.get_log().debug('Success, can open mod settings.')
+        if log.enabled:
+            log.debug('Success, can open mod settings.')
         return cls.create_test_result(True)
 
     # noinspection PyMissingOrEmptyDocstring
     def on_started(self, interaction_sim: Sim, interaction_target: Any) -> bool:
         source_sim_info = CommonSimUtils.get_sim_info(interaction_sim)
-        self._mod_settings_menu.open(source_sim_info, target=interaction_target)
+        self.get_mod_settings_menu().open(source_sim_info, target=interaction_target)
         return True
@@ -0,0 +1,102 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+from typing import Dict, Tuple, Union, Iterable
+
+from objects.script_object import ScriptObject
+from sims4communitylib.services.common_service import CommonService
+from sims4communitylib.utils.common_type_utils import CommonTypeUtils
+from sims4communitylib.utils.objects.common_object_tag_utils import CommonObjectTagUtils
+
+
+class S4MSMScriptObjectFilter(CommonService):
+    """S4MSMScriptObjectFilter()
+
+    Decides which Script Objects receive the Open Mod Settings interaction when they are loaded.
+
+    Sims always receive the interaction. Other objects receive it too, unless the filter is set to Sims only. A whitelist of object tags may narrow them down further.
+
+    .. note:: The registered menu items are not considered, menu items registered after objects have loaded would not be able to reach them.
+
+    .. note:: The decision is made once per object definition and remembered until the filter changes.
+
+    """
+    def __init__(self) -> None:
+        self._sims_only: bool = False
+        self._object_tags: Union[Tuple[int], None] = None
+        self._should_add_by_definition_id: Dict[int, bool] = dict()
+
+    @property
+    def sims_only(self) -> bool:
+        """
+        Whether or not only Sims receive the interaction.
+
+        :return: True, if only Sims receive the interaction. False, if other objects may receive it too.
+        :rtype: bool
+        """
+        return self._sims_only
+
+    @property
+    def object_tags(self) -> Union[Tuple[int], None]:
+        """
+        The tags an object other than a Sim must have at least one of to receive the interaction.
+
+        :return: A collection of tags or None if objects are not filtered by tag.
+        :rtype: Union[Tuple[int], None]
+        """
+        return self._object_tags
+
+    def set_sims_only(self, sims_only: bool) -> None:
+        """set_sims_only(sims_only)
+
+        Set whether or not only Sims receive the interaction.
+
+        :param sims_only: True, if only Sims should receive the interaction. False, if other objects may receive it too.
+        :type sims_only: bool
+        """
+        self._sims_only = sims_only
+        self._should_add_by_definition_id.clear()
+
+    def set_object_tags(self, object_tags: Union[Iterable[int], None]) -> None:
+        """set_object_tags(object_tags)
+
+        Set the tags an object other than a Sim must have at least one of to receive the interaction.
+
+        :param object_tags: A collection of tags or None to stop filtering objects by tag.
+        :type object_tags: Union[Iterable[int], None]
+        """
+        self._object_tags = tuple(object_tags) if object_tags is not None else None
+        self._should_add_by_definition_id.clear()
+
+    def should_add(self, script_object: ScriptObject) -> bool:
+        """should_add(script_object)
+
+        Determine if a Script Object should receive the Open Mod Settings interaction.
+
+        :param script_object: An instance of a Script Object.
+        :type script_object: ScriptObject
+        :return: True, if the Script Object should receive the interaction. False, if not.
+        :rtype: bool
+        """
+        definition = getattr(script_object, 'definition', None)
+        if definition is None:
+            return self._should_add(script_object)
+        should_add = self._should_add_by_definition_id.get(definition.id, None)
+        if should_add is None:
+            should_add = self._should_add(script_object)
+            self._should_add_by_definition_id[definition.id] = should_add
+        return should_add
+
+    def _should_add(self, script_object: ScriptObject) -> bool:
+        if CommonTypeUtils.is_sim_instance(script_object):
+            return True
+        if self._sims_only:
+            return False
+        if self._object_tags is None:
+            return True
+        return CommonObjectTagUtils.has_game_tags(script_object, self._object_tags)
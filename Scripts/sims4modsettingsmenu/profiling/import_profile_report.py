@@ -0,0 +1,48 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+import os
+
+from sims4communitylib.events.event_handling.common_event_registry import CommonEventRegistry
+from sims4communitylib.events.zone_spin.events.zone_late_load import S4CLZoneLateLoadEvent
+from sims4communitylib.utils.common_log_utils import CommonLogUtils
+from sims4modsettingsmenu.modinfo import ModInfo
+from sims4modsettingsmenu.profiling.import_profiler import S4MSMImportProfiler
+
+_IMPORT_PROFILE_FILE_NAME = 's4msm_import_profile.txt'
+
+
+def write_import_profile() -> str:
+    """write_import_profile()
+
+    Write the imports recorded by the import profiler to the mod logs folder.
+
+    :return: The path to the written report.
+    :rtype: str
+    """
+    records = S4MSMImportProfiler.get_records()
+    file_path = os.path.join(CommonLogUtils.get_mod_logs_location_path(), _IMPORT_PROFILE_FILE_NAME)
+    with open(file_path, 'w') as report_file:
+        report_file.write(f'{len(records)} module import(s), total {round(sum(record.total_time for record in records if record.depth == 0) * 1000, 3)} ms\n')
+        report_file.write('\nSlowest imports (self time, in milliseconds):\n')
+        for record in sorted(records, key=lambda _record: _record.self_time, reverse=True)[:25]:
+            report_file.write(f'{round(record.self_time * 1000, 3):>10} {record.module_name}\n')
+        report_file.write('\nImport tree (total time | self time, in milliseconds):\n')
+        for record in records:
+            report_file.write(f'{round(record.total_time * 1000, 3):>10} | {round(record.self_time * 1000, 3):>10} {"  " * record.depth}{record.module_name}\n')
+    return file_path
+
+
+@CommonEventRegistry.handle_events(ModInfo.get_identity())
+def _s4msm_write_import_profile_on_zone_load(event_data: S4CLZoneLateLoadEvent) -> bool:
+    # Everything the package imports at startup has been imported by the time the first zone loads.
+    if not S4MSMImportProfiler.is_running():
+        return False
+    S4MSMImportProfiler.stop()
+    write_import_profile()
+    return True
@@ -0,0 +1,119 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+import builtins
+import sys
+import time
+from typing import List, Any, Callable, Union
+
+# This module is loaded before anything else in the package, so it must not import anything outside of the standard library.
+
+
+class S4MSMImportRecord:
+    """S4MSMImportRecord(module_name, depth)
+
+    The time it took to import a module.
+
+    """
+    __slots__ = ('module_name', 'depth', 'total_time', 'child_time')
+
+    def __init__(self, module_name: str, depth: int) -> None:
+        self.module_name = module_name
+        self.depth = depth
+        self.total_time: float = 0.0
+        self.child_time: float = 0.0
+
+    @property
+    def self_time(self) -> float:
+        """
+        The time spent importing the module itself, excluding the modules it imported.
+
+        :return: The number of seconds spent importing the module itself.
+        :rtype: float
+        """
+        return self.total_time - self.child_time
+
+
+class S4MSMImportProfiler:
+    """S4MSMImportProfiler()
+
+    Records the wall time of every module imported by, or belonging to, the sims4modsettingsmenu package.
+
+    .. note:: The profiler is started when the environment variable S4MSM_PROFILE_IMPORTS is set before the game starts.
+
+    """
+    _PACKAGE_NAME = 'sims4modsettingsmenu'
+    _original_import: Union[Callable[..., Any], None] = None
+    _records: List[S4MSMImportRecord] = list()
+    _record_stack: List[S4MSMImportRecord] = list()
+
+    @classmethod
+    def is_running(cls) -> bool:
+        """is_running()
+
+        Determine if the profiler is recording imports.
+
+        :return: True, if imports are being recorded. False, if not.
+        :rtype: bool
+        """
+        return cls._original_import is not None
+
+    @classmethod
+    def get_records(cls) -> List[S4MSMImportRecord]:
+        """get_records()
+
+        Retrieve the recorded imports, in the order they started.
+
+        :return: A collection of recorded imports.
+        :rtype: List[S4MSMImportRecord]
+        """
+        return list(cls._records)
+
+    @classmethod
+    def start(cls) -> None:
+        """start()
+
+        Start recording imports.
+        """
+        if cls._original_import is not None:
+            return
+        cls._original_import = builtins.__import__
+        builtins.__import__ = cls._import
+
+    @classmethod
+    def stop(cls) -> None:
+        """stop()
+
+        Stop recording imports.
+        """
+        if cls._original_import is None:
+            return
+        builtins.__import__ = cls._original_import
+        cls._original_import = None
+
+    @classmethod
+    def _import(cls, name: str, globals_: dict = None, locals_: dict = None, fromlist: tuple = (), level: int = 0) -> Any:
+        original_import = cls._original_import
+        if level == 0 and name in sys.modules:
+            # Already imported, nothing to record.
+            return original_import(name, globals_, locals_, fromlist, level)
+        if not cls._record_stack:
+            importer_name = globals_.get('__name__', '') if globals_ else ''
+            if not name.startswith(cls._PACKAGE_NAME) and not importer_name.startswith(cls._PACKAGE_NAME):
+                return original_import(name, globals_, locals_, fromlist, level)
+        record = S4MSMImportRecord(name, len(cls._record_stack))
+        cls._records.append(record)
+        cls._record_stack.append(record)
+        start_time = time.perf_counter()
+        try:
+            return original_import(name, globals_, locals_, fromlist, level)
+        finally:
+            record.total_time = time.perf_counter() - start_time
+            cls._record_stack.pop()
+            if cls._record_stack:
+                cls._record_stack[-1].child_time += record.total_time
@@ -0,0 +1,112 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+from typing import Callable, Any, Dict, Tuple
+
+from sims.sim_info import SimInfo
+
+
+class S4MSMAvailabilityPredicate:
+    """S4MSMAvailabilityPredicate(name, test)
+
+    A named test of a Sim and a Target, used to declare when a menu item is available.
+
+    Predicates may be combined with `&`, `|` and `~`. While the registry checks the availability of menu items, the result of each predicate is shared, by name, between all menu items.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        S4MSMAvailabilityPredicates.SOURCE_IS_HUMAN & ~S4MSMAvailabilityPredicates.TARGET_IS_SIM
+
+    :param name: A name unique to what the predicate tests. Predicates with the same name are expected to give the same results.
+    :type name: str
+    :param test: A function that tests a Sim and a Target.
+    :type test: Callable[[SimInfo, Any], bool]
+    """
+    __slots__ = ('_name', '_test')
+
+    def __init__(self, name: str, test: Callable[[SimInfo, Any], bool]) -> None:
+        self._name = name
+        self._test = test
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the predicate.
+
+        :return: The name of the predicate.
+        :rtype: str
+        """
+        return self._name
+
+    def evaluate(self, source_sim_info: SimInfo, target: Any = None, results: Dict[str, bool] = None) -> bool:
+        """evaluate(source_sim_info, target=None, results=None)
+
+        Evaluate the predicate.
+
+        :param source_sim_info: An instance of a Sim.
+        :type source_sim_info: SimInfo
+        :param target: An instance of an object. Default is None.
+        :type target: Any, optional
+        :param results: Results of predicates already evaluated for the same Sim and Target, by name. Default is None.
+        :type results: Dict[str, bool], optional
+        :return: True, if the Sim and Target pass the predicate. False, if not.
+        :rtype: bool
+        """
+        if results is None:
+            return bool(self._test(source_sim_info, target))
+        result = results.get(self._name, None)
+        if result is None:
+            result = bool(self._test(source_sim_info, target))
+            results[self._name] = result
+        return result
+
+    def __and__(self, other: 'S4MSMAvailabilityPredicate') -> 'S4MSMAvailabilityPredicate':
+        return _S4MSMAllAvailabilityPredicate((self, other))
+
+    def __or__(self, other: 'S4MSMAvailabilityPredicate') -> 'S4MSMAvailabilityPredicate':
+        return _S4MSMAnyAvailabilityPredicate((self, other))
+
+    def __invert__(self) -> 'S4MSMAvailabilityPredicate':
+        return _S4MSMNotAvailabilityPredicate(self)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} {self._name}>'
+
+
+class _S4MSMAllAvailabilityPredicate(S4MSMAvailabilityPredicate):
+    __slots__ = ('_predicates',)
+
+    def __init__(self, predicates: Tuple[S4MSMAvailabilityPredicate, ...]) -> None:
+        super().__init__(f'({" & ".join(predicate.name for predicate in predicates)})', None)
+        self._predicates = predicates
+
+    def evaluate(self, source_sim_info: SimInfo, target: Any = None, results: Dict[str, bool] = None) -> bool:
+        return all(predicate.evaluate(source_sim_info, target=target, results=results) for predicate in self._predicates)
+
+
+class _S4MSMAnyAvailabilityPredicate(S4MSMAvailabilityPredicate):
+    __slots__ = ('_predicates',)
+
+    def __init__(self, predicates: Tuple[S4MSMAvailabilityPredicate, ...]) -> None:
+        super().__init__(f'({" | ".join(predicate.name for predicate in predicates)})', None)
+        self._predicates = predicates
+
+    def evaluate(self, source_sim_info: SimInfo, target: Any = None, results: Dict[str, bool] = None) -> bool:
+        return any(predicate.evaluate(source_sim_info, target=target, results=results) for predicate in self._predicates)
+
+
+class _S4MSMNotAvailabilityPredicate(S4MSMAvailabilityPredicate):
+    __slots__ = ('_predicate',)
+
+    def __init__(self, predicate: S4MSMAvailabilityPredicate) -> None:
+        super().__init__(f'~{predicate.name}', None)
+        self._predicate = predicate
+
+    def evaluate(self, source_sim_info: SimInfo, target: Any = None, results: Dict[str, bool] = None) -> bool:
+        return not self._predicate.evaluate(source_sim_info, target=target, results=results)
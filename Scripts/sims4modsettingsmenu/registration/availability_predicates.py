@@ -0,0 +1,34 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+from typing import Any
+
+from sims.sim_info import SimInfo
+from sims4communitylib.utils.common_type_utils import CommonTypeUtils
+from sims4communitylib.utils.sims.common_age_utils import CommonAgeUtils
+from sims4communitylib.utils.sims.common_sim_utils import CommonSimUtils
+from sims4communitylib.utils.sims.common_species_utils import CommonSpeciesUtils
+from sims4modsettingsmenu.registration.availability_predicate import S4MSMAvailabilityPredicate
+
+
+def _target_is_human(_: SimInfo, target: Any) -> bool:
+    return CommonTypeUtils.is_sim_or_sim_info(target) and CommonSpeciesUtils.is_human(CommonSimUtils.get_sim_info(target))
+
+
+def _target_is_source(source_sim_info: SimInfo, target: Any) -> bool:
+    return CommonTypeUtils.is_sim_or_sim_info(target) and CommonSimUtils.get_sim_info(target) is source_sim_info
+
+
+class S4MSMAvailabilityPredicates:
+    """ Commonly used availability predicates. """
+    SOURCE_IS_HUMAN = S4MSMAvailabilityPredicate('source_is_human', lambda source_sim_info, _: CommonSpeciesUtils.is_human(source_sim_info))
+    SOURCE_IS_ANIMAL = S4MSMAvailabilityPredicate('source_is_animal', lambda source_sim_info, _: CommonSpeciesUtils.is_animal(source_sim_info))
+    SOURCE_IS_ADULT = S4MSMAvailabilityPredicate('source_is_adult', lambda source_sim_info, _: CommonAgeUtils.is_adult(source_sim_info))
+    TARGET_IS_SIM = S4MSMAvailabilityPredicate('target_is_sim', lambda _, target: CommonTypeUtils.is_sim_or_sim_info(target))
+    TARGET_IS_HUMAN = S4MSMAvailabilityPredicate('target_is_human', _target_is_human)
+    TARGET_IS_SOURCE = S4MSMAvailabilityPredicate('target_is_source', _target_is_source)
@@ -0,0 +1,86 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+import time
+from typing import Iterator, Tuple, List, Union
+
+from sims4modsettingsmenu.registration.mod_settings_menu_item import S4MSMMenuItem
+
+
+class S4MSMAvailableMenuItems:
+    """S4MSMAvailableMenuItems(menu_item_availability_gen, time_budget=None)
+
+    The menu items available for a Sim and a Target.
+
+    Availability is only determined as far as the requested pages need and the evaluation may be resumed at a later time.
+
+    :param menu_item_availability_gen: An iterator of menu items along with whether or not they are available.
+    :type menu_item_availability_gen: Iterator[Tuple[S4MSMMenuItem, bool]]
+    :param time_budget: The maximum number of seconds a single request may spend testing menu items. Default is None (No limit).
+    :type time_budget: Union[float, None], optional
+    """
+    def __init__(self, menu_item_availability_gen: Iterator[Tuple[S4MSMMenuItem, bool]], time_budget: Union[float, None] = None) -> None:
+        self._menu_item_availability_gen = menu_item_availability_gen
+        self._time_budget = time_budget
+        self._available_menu_items: List[S4MSMMenuItem] = list()
+        self._is_exhausted = False
+
+    @property
+    def is_exhausted(self) -> bool:
+        """
+        Whether or not every menu item has been tested.
+
+        :return: True, if every menu item has been tested. False, if some menu items are still waiting to be tested.
+        :rtype: bool
+        """
+        return self._is_exhausted
+
+    @property
+    def available_count(self) -> int:
+        """
+        The number of menu items found to be available so far.
+
+        :return: The number of available menu items found so far.
+        :rtype: int
+        """
+        return len(self._available_menu_items)
+
+    def get_page(self, page: int, per_page: int, look_ahead: int = 0) -> Tuple[Tuple[S4MSMMenuItem], bool]:
+        """get_page(page, per_page, look_ahead=0)
+
+        Retrieve the available menu items of a page.
+
+        .. note:: If the time budget runs out, the page may contain fewer menu items than it would otherwise. Use `is_exhausted` to know if more menu items are still waiting to be tested.
+
+        :param page: The page to retrieve, starting at 1.
+        :type page: int
+        :param per_page: The number of menu items per page.
+        :type per_page: int
+        :param look_ahead: The number of menu items to evaluate beyond the page. At least one is always evaluated. Default is 0.
+        :type look_ahead: int, optional
+        :return: The available menu items of the page and whether or not there is a next page.
+        :rtype: Tuple[Tuple[S4MSMMenuItem], bool]
+        """
+        start_index = (page - 1) * per_page
+        end_index = start_index + per_page
+        self._evaluate_up_to(end_index + max(look_ahead, 1))
+        return tuple(self._available_menu_items[start_index:end_index]), len(self._available_menu_items) > end_index
+
+    def _evaluate_up_to(self, count: int) -> None:
+        deadline = None if self._time_budget is None else time.perf_counter() + self._time_budget
+        while not self._is_exhausted and len(self._available_menu_items) < count:
+            try:
+                (menu_item, is_available) = next(self._menu_item_availability_gen)
+            except StopIteration:
+                self._is_exhausted = True
+                break
+            if is_available:
+                self._available_menu_items.append(menu_item)
+            # At least one menu item is tested per request, so the evaluation always makes progress.
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
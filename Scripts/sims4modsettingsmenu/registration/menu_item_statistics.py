@@ -0,0 +1,131 @@
+"""
+This file is part of the The Sims 4 Mod Settings Menu licensed under the Creative Commons Attribution 4.0 International public license (CC BY 4.0).
+
+https://creativecommons.org/licenses/by/4.0/
+https://creativecommons.org/licenses/by/4.0/legalcode
+
+Copyright (c) COLONOLNUTTY
+"""
+
+
+class S4MSMMenuItemStatistics:
+    """S4MSMMenuItemStatistics()
+
+    Statistics about how a registered menu item responds to availability tests and how long it takes to show.
+
+    """
+    __slots__ = (
+        'test_count',
+        'available_count',
+        'total_test_time',
+        'max_test_time',
+        'last_test_result',
+        'show_count',
+        'total_show_time',
+        'max_show_time',
+        'strike_count',
+        'is_quarantined',
+        'quarantine_retest_time'
+    )
+
+    def __init__(self) -> None:
+        self.test_count: int = 0
+        self.available_count: int = 0
+        self.total_test_time: float = 0.0
+        self.max_test_time: float = 0.0
+        self.last_test_result: bool = False
+        self.show_count: int = 0
+        self.total_show_time: float = 0.0
+        self.max_show_time: float = 0.0
+        # The number of recent availability tests that were slow or failed.
+        self.strike_count: int = 0
+        self.is_quarantined: bool = False
+        # The real time (As returned by time.perf_counter) at which a quarantined menu item may be tested again.
+        self.quarantine_retest_time: float = 0.0
+
+    @property
+    def available_rate(self) -> float:
+        """
+        The rate at which the menu item is available when tested.
+
+        .. note:: The rate is smoothed so menu items with few tests start out at 0.5.
+
+        :return: A value between 0.0 and 1.0.
+        :rtype: float
+        """
+        return (self.available_count + 1) / (self.test_count + 2)
+
+    @property
+    def average_test_time(self) -> float:
+        """
+        The average number of seconds an availability test of the menu item takes.
+
+        :return: The average number of seconds a test takes or 0.0 if the menu item has not been tested yet.
+        :rtype: float
+        """
+        if self.test_count == 0:
+            return 0.0
+        return self.total_test_time / self.test_count
+
+    @property
+    def average_show_time(self) -> float:
+        """
+        The average number of seconds showing the menu item takes.
+
+        :return: The average number of seconds showing takes or 0.0 if the menu item has not been shown yet.
+        :rtype: float
+        """
+        if self.show_count == 0:
+            return 0.0
+        return self.total_show_time / self.show_count
+
+    @property
+    def total_time(self) -> float:
+        """
+        The total number of seconds spent testing and showing the menu item.
+
+        :return: The total number of seconds spent on the menu item.
+        :rtype: float
+        """
+        return self.total_test_time + self.total_show_time
+
+    @property
+    def expected_cost(self) -> float:
+        """
+        The number of seconds expected to be spent testing the menu item per time it is found available.
+
+        :return: The expected number of seconds spent per available result.
+        :rtype: float
+        """
+        return self.average_test_time / self.available_rate
+
+    def record_test(self, is_available: bool, test_time: float) -> None:
+        """record_test(is_available, test_time)
+
+        Record the result of an availability test.
+
+        :param is_available: The result of the test.
+        :type is_available: bool
+        :param test_time: The number of seconds the test took.
+        :type test_time: float
+        """
+        self.test_count += 1
+        self.total_test_time += test_time
+        if test_time > self.max_test_time:
+            self.max_test_time = test_time
+        self.last_test_result = is_available
+        if is_available:
+            self.available_count += 1
+
+    def record_show(self, show_time: float) -> None:
+        """record_show(show_time)
+
+        Record the time it took to show the menu item.
+
+        :param show_time: The number of seconds showing took.
+        :type show_time: float
+        """
+        self.show_count += 1
+        self.total_show_time += show_time
+        if show_time > self.max_show_time:
+            self.max_show_time = show_time
@@ -15,7 +15,10 @@ from sims4communitylib.logging.has_log import HasLog
 from sims4communitylib.mod_support.mod_identity import CommonModIdentity
 from sims4communitylib.utils.common_function_utils import CommonFunctionUtils
 from sims4communitylib.utils.localization.common_localization_utils import CommonLocalizationUtils
+from sims4modsettingsmenu.enums.menu_item_source_type import S4MSMMenuItemSourceType
+from sims4modsettingsmenu.enums.menu_item_target_type import S4MSMMenuItemTargetType
 from sims4modsettingsmenu.enums.string_ids import S4MSMStringId
+from sims4modsettingsmenu.registration.availability_predicate import S4MSMAvailabilityPredicate
 
 
 class S4MSMMenuItem(HasLog):
@@ -23,17 +26,42 @@ class S4MSMMenuItem(HasLog):
 
     A menu item that will display in the Mod Settings Menu. When selected, it will display a dialog containing settings.
     """
+    __slots__ = ('_lazy_default_title', '_lazy_default_description')
 
     def __init__(self) -> None:
         super().__init__()
-        self._default_title = CommonLocalizationUtils.create_localized_string(S4MSMStringId.MOD_SETTINGS, tokens=(self.mod_name,))
-        self._default_description = CommonLocalizationUtils.create_localized_string(S4MSMStringId.ALL_SETTINGS_RELATED_TO_MOD, tokens=(self.mod_name,))
+        self._lazy_default_title: Union[LocalizedString, None] = None
+        self._lazy_default_description: Union[LocalizedString, None] = None
+
+    @property
+    def _default_title(self) -> LocalizedString:
+        # Created on first use, menu items that are never shown or have their own title never pay for it.
+        if self._lazy_default_title is None:
+            self._lazy_default_title = CommonLocalizationUtils.create_localized_string(S4MSMStringId.MOD_SETTINGS, tokens=(self.mod_name,))
+        return self._lazy_default_title
+
+    @_default_title.setter
+    def _default_title(self, value: LocalizedString):
+        self._lazy_default_title = value
+
+    @property
+    def _default_description(self) -> LocalizedString:
+        # Created on first use, menu items that are never shown or have their own description never pay for it.
+        if self._lazy_default_description is None:
+            self._lazy_default_description = CommonLocalizationUtils.create_localized_string(S4MSMStringId.ALL_SETTINGS_RELATED_TO_MOD, tokens=(self.mod_name,))
+        return self._lazy_default_description
+
+    @_default_description.setter
+    def _default_description(self, value: LocalizedString):
+        self._lazy_default_description = value
 
     @property
     def identifier(self) -> str:
         """
         An identifier used to sort alphabetically.
 
+        .. note:: The registry sorts menu items by this value once, when the menu item is registered.
+
         :return: A text identifier.
         :rtype: str
         """
@@ -111,6 +139,61 @@ class S4MSMMenuItem(HasLog):
         """
         return None
 
+    @property
+    def target_types(self) -> S4MSMMenuItemTargetType:
+        """
+        The kinds of Targets this menu item may be available for.
+
+        .. note:: The registry uses this value to skip calling `is_available_for` for Targets this menu item can never be available for. It is read once, when the menu item is registered.
+
+        :return: The kinds of Targets this menu item may be available for. Default is all of them.
+        :rtype: S4MSMMenuItemTargetType
+        """
+        return S4MSMMenuItemTargetType.ALL
+
+    @property
+    def source_types(self) -> S4MSMMenuItemSourceType:
+        """
+        The kinds of Source Sims this menu item may be available for.
+
+        .. note:: The registry uses this value to skip calling `is_available_for` for Sims this menu item can never be available for. It is read once, when the menu item is registered.
+
+        :return: The kinds of Source Sims this menu item may be available for. Default is all of them.
+        :rtype: S4MSMMenuItemSourceType
+        """
+        return S4MSMMenuItemSourceType.ALL
+
+    @property
+    def always_available(self) -> bool:
+        """
+        Whether or not this menu item is available for every Sim and Target of its `target_types` and `source_types`.
+
+        .. note:: Menu items that are always available are never tested with `is_available_for`. It is read once, when the menu item is registered.
+
+        :return: True, if this menu item is always available. False, if `is_available_for` must be used. Default is False.
+        :rtype: bool
+        """
+        return False
+
+    @property
+    def availability_predicate(self) -> Union[S4MSMAvailabilityPredicate, None]:
+        """
+        A predicate declaring when this menu item is available, used instead of `is_available_for`.
+
+        .. note:: While checking availability, the result of each predicate is shared between all menu items, so common tests such as "is the Sim human" only run once.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            @property
+            def availability_predicate(self) -> S4MSMAvailabilityPredicate:
+                return S4MSMAvailabilityPredicates.SOURCE_IS_ADULT & S4MSMAvailabilityPredicates.TARGET_IS_HUMAN
+
+        :return: A predicate or None if `is_available_for` should be used instead. Default is None.
+        :rtype: Union[S4MSMAvailabilityPredicate, None]
+        """
+        return None
+
     # noinspection PyMissingOrEmptyDocstring
     @property
     def mod_identity(self) -> CommonModIdentity:
@@ -135,6 +218,9 @@ class S4MSMMenuItem(HasLog):
         :return: True, if these settings are available for the Target. False, if not.
         :rtype: bool
         """
+        availability_predicate = self.availability_predicate
+        if availability_predicate is not None:
+            return availability_predicate.evaluate(source_sim_info, target=target)
         raise NotImplementedError(f'Missing \'{self.__class__.__name__}.is_available_for\'.')
 
     def show(
@@ -6,22 +6,76 @@ https://creativecommons.org/licenses/by/4.0/legalcode
 
 Copyright (c) COLONOLNUTTY
 """
-from typing import List, Any, Tuple, Iterator
+import heapq
+import itertools
+import time
+import weakref
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Any, Tuple, Iterator, Dict, Union, Hashable, Callable, Iterable
+from weakref import WeakKeyDictionary
 
+import services
+from objects.script_object import ScriptObject
 from sims.sim_info import SimInfo
 from sims4communitylib.logging.has_class_log import HasClassLog
 from sims4communitylib.mod_support.mod_identity import CommonModIdentity
 from sims4communitylib.services.common_service import CommonService
+from sims4communitylib.utils.common_function_utils import CommonFunctionUtils
+from sims4communitylib.utils.common_type_utils import CommonTypeUtils
+from sims4communitylib.utils.sims.common_sim_utils import CommonSimUtils
+from sims4communitylib.utils.sims.common_species_utils import CommonSpeciesUtils
+from sims4modsettingsmenu.enums.menu_item_source_type import S4MSMMenuItemSourceType
+from sims4modsettingsmenu.enums.menu_item_target_type import S4MSMMenuItemTargetType
 from sims4modsettingsmenu.modinfo import ModInfo
+from sims4modsettingsmenu.registration.available_menu_items import S4MSMAvailableMenuItems
+from sims4modsettingsmenu.registration.menu_item_statistics import S4MSMMenuItemStatistics
 from sims4modsettingsmenu.registration.mod_settings_menu_item import S4MSMMenuItem
 
 
+class _S4MSMStrongMenuItemReference:
+    # Mirrors weakref.ref, so strong and weak storage can be used in the same way.
+    __slots__ = ('_menu_item',)
+
+    def __init__(self, menu_item: S4MSMMenuItem) -> None:
+        self._menu_item = menu_item
+
+    def __call__(self) -> S4MSMMenuItem:
+        return self._menu_item
+
+
 class S4MSMModSettingsRegistry(CommonService, HasClassLog):
     """S4MSMModSettingsRegistry()
 
     A registry containing registered setting menus.
 
     """
+    _INDEXED_TARGET_TYPES: Tuple[S4MSMMenuItemTargetType] = (
+        S4MSMMenuItemTargetType.SIM,
+        S4MSMMenuItemTargetType.TERRAIN,
+        S4MSMMenuItemTargetType.OCEAN,
+        S4MSMMenuItemTargetType.SCRIPT_OBJECT,
+        S4MSMMenuItemTargetType.OTHER,
+    )
+    _INDEXED_SOURCE_TYPES: Tuple[S4MSMMenuItemSourceType] = (
+        S4MSMMenuItemSourceType.HUMAN,
+        S4MSMMenuItemSourceType.ANIMAL,
+    )
+    # The maximum number of (Sim, Target) availability results to remember.
+    _AVAILABILITY_CACHE_MAX_SIZE: int = 64
+    # The maximum number of real seconds an availability result is remembered for, even if the game is paused.
+    _AVAILABILITY_CACHE_MAX_AGE: float = 1.0
+    # The default maximum number of real seconds the Mod Settings Menu spends testing menu items before showing what it has.
+    _DEFAULT_EVALUATION_TIME_BUDGET: float = 0.05
+    # Availability tests taking longer than this number of real seconds count as a strike against the menu item.
+    _QUARANTINE_SLOW_TEST_TIME: float = 0.01
+    # The number of strikes after which a menu item is quarantined.
+    _QUARANTINE_STRIKE_LIMIT: int = 5
+    # The number of real seconds a quarantined menu item reuses its last result for before it is tested again.
+    _QUARANTINE_RETEST_INTERVAL: float = 30.0
+    # The number of availability tests after which menu items are ordered by their expected cost again.
+    _COST_ORDER_REFRESH_TEST_COUNT: int = 64
 
     # noinspection PyMissingOrEmptyDocstring
     @classmethod
@@ -35,19 +89,305 @@ class S4MSMModSettingsRegistry(CommonService, HasClassLog):
 
     def __init__(self) -> None:
         super().__init__()
-        self._registered_menu_items: List[S4MSMMenuItem] = list()
+        self._has_collected_menu_items: bool = False
+        self._collected_menu_item_count: int = 0
+        # Kept sorted by identifier, so available menu items come out in display order.
+        self._registered_menu_item_refs: List[Callable[[], Union[S4MSMMenuItem, None]]] = list()
+        self._registered_menu_item_identifiers: List[str] = list()
+        self._menu_item_refs_by_type: Dict[Tuple[S4MSMMenuItemTargetType, S4MSMMenuItemSourceType], List[Callable[[], Union[S4MSMMenuItem, None]]]] = dict()
+        # Menu items that are always available are never tested, so they are kept apart from the ones that are.
+        self._always_available_menu_item_refs_by_type: Dict[Tuple[S4MSMMenuItemTargetType, S4MSMMenuItemSourceType], Tuple[Callable[[], Union[S4MSMMenuItem, None]]]] = dict()
+        self._menu_item_statistics: 'WeakKeyDictionary[S4MSMMenuItem, S4MSMMenuItemStatistics]' = WeakKeyDictionary()
+        self._evaluation_time_budget: Union[float, None] = self._DEFAULT_EVALUATION_TIME_BUDGET
+        self._generation: int = 0
+        self._availability_cache: 'OrderedDict[Hashable, Tuple[int, float, bool]]' = OrderedDict()
+        self._test_count: int = 0
+        # Per kind of Target and Sim, the menu items to test ordered by expected cost, along with the generation and test count they were ordered at.
+        self._cost_ordered_menu_item_refs_by_type: Dict[Tuple[S4MSMMenuItemTargetType, S4MSMMenuItemSourceType], Tuple[int, int, Tuple[Callable[[], Union[S4MSMMenuItem, None]]]]] = dict()
+        self._registration_transaction_depth: int = 0
+        self._pending_menu_items: List[Tuple[S4MSMMenuItem, bool]] = list()
+        self._has_pending_changes: bool = False
+
+    @property
+    def generation(self) -> int:
+        """
+        A number that increases every time the registered menu items change.
+
+        .. note:: Anything derived from the registered menu items may store this number and compare it later, to know when it has become stale.
+
+        :return: The current generation of the registry.
+        :rtype: int
+        """
+        return self._generation
+
+    @property
+    def collected_menu_item_count(self) -> int:
+        """
+        The number of registered menu items that were garbage collected and pruned from the registry.
+
+        :return: The number of collected menu items.
+        :rtype: int
+        """
+        return self._collected_menu_item_count
+
+    @classmethod
+    def register_menu_item(cls, menu_item: S4MSMMenuItem, weak: bool = False):
+        """register_menu_item(menu_item, weak=False)
+
+        :param menu_item: An instance of a menu item.
+        :type menu_item: S4MSMMenuItem
+        :param weak: If True, the registry only holds a weak reference to the menu item and it is removed from the registry once nothing else references it. Default is False.
+        :type weak: bool, optional
+        """
+        cls()._register_menu_item(menu_item, weak=weak)
+
+    @classmethod
+    def register_menu_items(cls, menu_items: Iterable[S4MSMMenuItem], weak: bool = False):
+        """register_menu_items(menu_items, weak=False)
+
+        Register many menu items at once. The registry is only rebuilt once, after all of them are registered.
+
+        :param menu_items: A collection of menu items.
+        :type menu_items: Iterable[S4MSMMenuItem]
+        :param weak: If True, the registry only holds weak references to the menu items. Default is False.
+        :type weak: bool, optional
+        """
+        with cls.registration_transaction():
+            for menu_item in menu_items:
+                cls.register_menu_item(menu_item, weak=weak)
+
+    @classmethod
+    def unregister_menu_item(cls, identifier: str) -> int:
+        """unregister_menu_item(identifier)
+
+        Unregister the menu items with an identifier.
+
+        :param identifier: The identifier of the menu items to unregister.
+        :type identifier: str
+        :return: The number of menu items that were unregistered.
+        :rtype: int
+        """
+        return cls()._unregister_menu_item(identifier)
 
     @classmethod
-    def register_menu_item(cls, menu_item: S4MSMMenuItem):
-        """register_menu_item(menu_item)
+    def replace_menu_item(cls, menu_item: S4MSMMenuItem, weak: bool = False) -> int:
+        """replace_menu_item(menu_item, weak=False)
+
+        Replace the menu items that have the same identifier as a menu item with that menu item. If none are registered, the menu item is simply registered.
+
+        .. note:: This is useful for mods that reload their scripts, as registering the menu item again would add a duplicate.
 
         :param menu_item: An instance of a menu item.
         :type menu_item: S4MSMMenuItem
+        :param weak: If True, the registry only holds a weak reference to the menu item. Default is False.
+        :type weak: bool, optional
+        :return: The number of menu items that were replaced.
+        :rtype: int
         """
-        cls()._register_menu_item(menu_item)
+        with cls.registration_transaction():
+            replaced_count = cls.unregister_menu_item(menu_item.identifier)
+            cls.register_menu_item(menu_item, weak=weak)
+        return replaced_count
+
+    @classmethod
+    @contextmanager
+    def registration_transaction(cls) -> Iterator[None]:
+        """registration_transaction()
+
+        A context within which registered menu items are collected and only added to the registry once the context ends.
+
+        .. note:: Menu items registered within the context will not be available until the outermost context ends.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            with S4MSMModSettingsRegistry.registration_transaction():
+                S4MSMModSettingsRegistry.register_menu_item(MyFirstMenuItem())
+                S4MSMModSettingsRegistry.register_menu_item(MySecondMenuItem())
+
+        """
+        registry = cls()
+        registry._registration_transaction_depth += 1
+        try:
+            yield
+        finally:
+            registry._registration_transaction_depth -= 1
+            if registry._registration_transaction_depth == 0:
+                registry._end_registration_transaction()
+
+    def _register_menu_item(self, menu_item: S4MSMMenuItem, weak: bool = False):
+        self._menu_item_statistics[menu_item] = S4MSMMenuItemStatistics()
+        if self._registration_transaction_depth > 0:
+            self._pending_menu_items.append((menu_item, weak))
+            return
+        identifier = menu_item.identifier
+        insert_index = bisect_right(self._registered_menu_item_identifiers, identifier)
+        self._registered_menu_item_identifiers.insert(insert_index, identifier)
+        self._registered_menu_item_refs.insert(insert_index, self._create_menu_item_ref(menu_item, weak))
+        self._on_registered_menu_items_changed()
+
+    def _unregister_menu_item(self, identifier: str) -> int:
+        start_index = bisect_left(self._registered_menu_item_identifiers, identifier)
+        end_index = bisect_right(self._registered_menu_item_identifiers, identifier)
+        unregistered_menu_items = [menu_item_ref() for menu_item_ref in self._registered_menu_item_refs[start_index:end_index]]
+        del self._registered_menu_item_refs[start_index:end_index]
+        del self._registered_menu_item_identifiers[start_index:end_index]
+        remaining_pending_menu_items = list()
+        for (pending_menu_item, weak) in self._pending_menu_items:
+            if pending_menu_item.identifier == identifier:
+                unregistered_menu_items.append(pending_menu_item)
+            else:
+                remaining_pending_menu_items.append((pending_menu_item, weak))
+        self._pending_menu_items = remaining_pending_menu_items
+        if not unregistered_menu_items:
+            return 0
+        for menu_item in unregistered_menu_items:
+            if menu_item is not None:
+                self._menu_item_statistics.pop(menu_item, None)
+        self._on_registered_menu_items_changed()
+        return len(unregistered_menu_items)
+
+    def _end_registration_transaction(self):
+        if self._prune_collected_menu_items() > 0:
+            self._has_pending_changes = True
+        if self._pending_menu_items:
+            # The existing references are kept as they are, so every menu item stays weakly or strongly held as it was registered.
+            # The sort is stable, so menu items with the same identifier stay in the order they were registered.
+            registered_menu_item_entries = list(zip(self._registered_menu_item_identifiers, self._registered_menu_item_refs))
+            registered_menu_item_entries.extend((menu_item.identifier, self._create_menu_item_ref(menu_item, weak)) for (menu_item, weak) in self._pending_menu_items)
+            registered_menu_item_entries.sort(key=lambda entry: entry[0])
+            self._registered_menu_item_identifiers = [identifier for (identifier, _) in registered_menu_item_entries]
+            self._registered_menu_item_refs = [menu_item_ref for (_, menu_item_ref) in registered_menu_item_entries]
+            self._pending_menu_items.clear()
+            self._has_pending_changes = True
+        if self._has_pending_changes:
+            self._on_registered_menu_items_changed()
+
+    def _on_registered_menu_items_changed(self):
+        if self._registration_transaction_depth > 0:
+            self._has_pending_changes = True
+            return
+        self._has_pending_changes = False
+        self._rebuild_menu_item_index()
+        self._generation += 1
+        self._availability_cache.clear()
+        self._cost_ordered_menu_item_refs_by_type.clear()
+
+    def _create_menu_item_ref(self, menu_item: S4MSMMenuItem, weak: bool) -> Callable[[], Union[S4MSMMenuItem, None]]:
+        if weak:
+            return weakref.ref(menu_item, self._on_menu_item_collected)
+        return _S4MSMStrongMenuItemReference(menu_item)
 
-    def _register_menu_item(self, menu_item: S4MSMMenuItem):
-        self._registered_menu_items.append(menu_item)
+    def _on_menu_item_collected(self, _: weakref.ref):
+        # Called by the garbage collector, the dead references are pruned during the next availability scan.
+        self._has_collected_menu_items = True
+
+    def _get_registered_menu_items(self) -> Tuple[S4MSMMenuItem]:
+        registered_menu_items = tuple(menu_item_ref() for menu_item_ref in self._registered_menu_item_refs)
+        return tuple(menu_item for menu_item in registered_menu_items if menu_item is not None)
+
+    def _prune_collected_menu_items(self) -> int:
+        self._has_collected_menu_items = False
+        remaining_menu_item_refs = list()
+        remaining_menu_item_identifiers = list()
+        for (menu_item_ref, identifier) in zip(self._registered_menu_item_refs, self._registered_menu_item_identifiers):
+            if menu_item_ref() is None:
+                continue
+            remaining_menu_item_refs.append(menu_item_ref)
+            remaining_menu_item_identifiers.append(identifier)
+        collected_count = len(self._registered_menu_item_refs) - len(remaining_menu_item_refs)
+        if collected_count == 0:
+            return 0
+        self._registered_menu_item_refs = remaining_menu_item_refs
+        self._registered_menu_item_identifiers = remaining_menu_item_identifiers
+        self._collected_menu_item_count += collected_count
+        if self.log.enabled:
+            self.log.format_with_message('Pruned collected menu items.', collected_count=collected_count, total_collected_count=self._collected_menu_item_count)
+        return collected_count
+
+    def _rebuild_menu_item_index(self):
+        self._menu_item_refs_by_type.clear()
+        always_available_menu_item_refs_by_type: Dict[Tuple[S4MSMMenuItemTargetType, S4MSMMenuItemSourceType], List[Callable[[], Union[S4MSMMenuItem, None]]]] = dict()
+        for menu_item_ref in self._registered_menu_item_refs:
+            menu_item = menu_item_ref()
+            if menu_item is None:
+                continue
+            if menu_item.always_available:
+                self._index_menu_item(menu_item, menu_item_ref, always_available_menu_item_refs_by_type)
+            else:
+                self._index_menu_item(menu_item, menu_item_ref, self._menu_item_refs_by_type)
+        self._always_available_menu_item_refs_by_type = {key: tuple(menu_item_refs) for (key, menu_item_refs) in always_available_menu_item_refs_by_type.items()}
+
+    def _index_menu_item(
+        self,
+        menu_item: S4MSMMenuItem,
+        menu_item_ref: Callable[[], Union[S4MSMMenuItem, None]],
+        menu_item_refs_by_type: Dict[Tuple[S4MSMMenuItemTargetType, S4MSMMenuItemSourceType], List[Callable[[], Union[S4MSMMenuItem, None]]]]
+    ):
+        target_types = menu_item.target_types
+        source_types = menu_item.source_types
+        for target_type in self._INDEXED_TARGET_TYPES:
+            if not target_types & target_type:
+                continue
+            for source_type in self._INDEXED_SOURCE_TYPES:
+                if not source_types & source_type:
+                    continue
+                key = (target_type, source_type)
+                if key not in menu_item_refs_by_type:
+                    menu_item_refs_by_type[key] = list()
+                menu_item_refs_by_type[key].append(menu_item_ref)
+
+    def _get_index_key(self, source_sim_info: SimInfo, target: Any = None) -> Tuple[S4MSMMenuItemTargetType, S4MSMMenuItemSourceType]:
+        if self._has_collected_menu_items and self._prune_collected_menu_items() > 0:
+            self._on_registered_menu_items_changed()
+        return self._get_target_type(target), self._get_source_type(source_sim_info)
+
+    def _get_cost_ordered_menu_item_refs(self, key: Tuple[S4MSMMenuItemTargetType, S4MSMMenuItemSourceType]) -> Tuple[Callable[[], Union[S4MSMMenuItem, None]]]:
+        # Ordering is only refreshed once enough new test results have come in, not on every check.
+        cost_ordered_entry = self._cost_ordered_menu_item_refs_by_type.get(key, None)
+        if cost_ordered_entry is not None:
+            (generation, test_count, cost_ordered_menu_item_refs) = cost_ordered_entry
+            if generation == self._generation and self._test_count - test_count < self._COST_ORDER_REFRESH_TEST_COUNT:
+                return cost_ordered_menu_item_refs
+        empty_statistics = S4MSMMenuItemStatistics()
+        menu_item_costs = list()
+        for menu_item_ref in self._menu_item_refs_by_type.get(key, tuple()):
+            menu_item = menu_item_ref()
+            if menu_item is None:
+                continue
+            menu_item_costs.append((self._menu_item_statistics.get(menu_item, empty_statistics).expected_cost, menu_item_ref))
+        menu_item_costs.sort(key=lambda entry: entry[0])
+        cost_ordered_menu_item_refs = tuple(menu_item_ref for (_, menu_item_ref) in menu_item_costs)
+        self._cost_ordered_menu_item_refs_by_type[key] = (self._generation, self._test_count, cost_ordered_menu_item_refs)
+        return cost_ordered_menu_item_refs
+
+    @staticmethod
+    def _iterate_menu_item_refs(menu_item_refs: Iterable[Callable[[], Union[S4MSMMenuItem, None]]]) -> Iterator[S4MSMMenuItem]:
+        # Dereferenced as they are needed, scans that stop at the first available menu item skip the rest.
+        for menu_item_ref in menu_item_refs:
+            menu_item = menu_item_ref()
+            if menu_item is not None:
+                yield menu_item
+
+    @staticmethod
+    def _get_target_type(target: Any) -> S4MSMMenuItemTargetType:
+        if target is None:
+            return S4MSMMenuItemTargetType.OTHER
+        if CommonTypeUtils.is_sim_or_sim_info(target):
+            return S4MSMMenuItemTargetType.SIM
+        if CommonTypeUtils.is_terrain(target):
+            return S4MSMMenuItemTargetType.TERRAIN
+        if CommonTypeUtils.is_ocean(target):
+            return S4MSMMenuItemTargetType.OCEAN
+        if isinstance(target, ScriptObject):
+            return S4MSMMenuItemTargetType.SCRIPT_OBJECT
+        return S4MSMMenuItemTargetType.OTHER
+
+    @staticmethod
+    def _get_source_type(source_sim_info: SimInfo) -> S4MSMMenuItemSourceType:
+        if CommonSpeciesUtils.is_human(source_sim_info):
+            return S4MSMMenuItemSourceType.HUMAN
+        return S4MSMMenuItemSourceType.ANIMAL
 
     def has_menu_items_available_for(self, source_sim_info: SimInfo, target: Any = None) -> bool:
         """has_menu_items_available_for(source_sim_info, target=target)
@@ -61,10 +401,19 @@ class S4MSMModSettingsRegistry(CommonService, HasClassLog):
         :return: True, if menu items are available for the Target. False, if not.
         :rtype: bool
         """
-        self.log.format_with_message('Checking if any menu items are available for Sim and Target.', sim=source_sim_info, target=target)
-        for _ in self._get_menu_items_available_for_gen(source_sim_info, target=target):
+        if self.log.enabled:
+            self.log.format_with_message('Checking if any menu items are available for Sim and Target.', sim=source_sim_info, target=target)
+        cache_key = self._get_availability_cache_key(source_sim_info, target=target)
+        cached_result = self._get_cached_availability(cache_key)
+        if cached_result is not None:
+            return cached_result
+        # Only one available menu item is needed, so test the cheapest and most likely to be available ones first.
+        for _ in self._get_menu_items_available_for_gen(source_sim_info, target=target, order_by_expected_cost=True):
+            self._set_cached_availability(cache_key, True)
             return True
-        self.log.format_with_message('No menu items are available for Sim and Target.', sim=source_sim_info, target=target)
+        if self.log.enabled:
+            self.log.format_with_message('No menu items are available for Sim and Target.', sim=source_sim_info, target=target)
+        self._set_cached_availability(cache_key, False)
         return False
 
     def get_menu_items_available_for(self, source_sim_info: SimInfo, target: Any = None) -> Tuple[S4MSMMenuItem]:
@@ -76,21 +425,255 @@ class S4MSMModSettingsRegistry(CommonService, HasClassLog):
         :type source_sim_info: SimInfo
         :param target: An instance of an object. Default is None.
         :type target: Any, optional
-        :return: A collection of menu items available for a Sim and a Target.
+        :return: A collection of menu items available for a Sim and a Target, sorted by their identifier.
         :rtype: Tuple[S4MSMMenuItem]
         """
-        self.log.format_with_message('Attempting to locate menu items available for Sim and Target.', sim=source_sim_info, target=target)
-        return tuple(self._get_menu_items_available_for_gen(source_sim_info, target=target))
+        if self.log.enabled:
+            self.log.format_with_message('Attempting to locate menu items available for Sim and Target.', sim=source_sim_info, target=target)
+        available_menu_items = tuple(self._get_menu_items_available_for_gen(source_sim_info, target=target))
+        self._set_cached_availability(self._get_availability_cache_key(source_sim_info, target=target), len(available_menu_items) > 0)
+        return available_menu_items
 
-    def _get_menu_items_available_for_gen(self, source_sim_info: SimInfo, target: Any = None) -> Iterator[S4MSMMenuItem]:
+    @property
+    def evaluation_time_budget(self) -> Union[float, None]:
+        """
+        The maximum number of real seconds a single request of the Mod Settings Menu may spend testing menu items.
+
+        :return: The maximum number of seconds or None if there is no limit.
+        :rtype: Union[float, None]
+        """
+        return self._evaluation_time_budget
+
+    def set_evaluation_time_budget(self, time_budget: Union[float, None]) -> None:
+        """set_evaluation_time_budget(time_budget)
+
+        Set the maximum number of real seconds a single request of the Mod Settings Menu may spend testing menu items.
+
+        :param time_budget: The maximum number of seconds or None for no limit.
+        :type time_budget: Union[float, None]
+        """
+        self._evaluation_time_budget = time_budget
+
+    def create_available_menu_items(self, source_sim_info: SimInfo, target: Any = None) -> S4MSMAvailableMenuItems:
+        """create_available_menu_items(source_sim_info, target=None)
+
+        Create a budgeted, resumable evaluation of the menu items available for a Sim and a Target.
+
+        :param source_sim_info: An instance of a Sim.
+        :type source_sim_info: SimInfo
+        :param target: An instance of an object. Default is None.
+        :type target: Any, optional
+        :return: The menu items available for a Sim and a Target, evaluated as they are requested.
+        :rtype: S4MSMAvailableMenuItems
+        """
+        if self.log.enabled:
+            self.log.format_with_message('Creating a budgeted evaluation of menu items available for Sim and Target.', sim=source_sim_info, target=target, time_budget=self._evaluation_time_budget)
+        return S4MSMAvailableMenuItems(self._get_menu_item_availability_gen(source_sim_info, target=target), time_budget=self._evaluation_time_budget)
+
+    def _get_availability_cache_key(self, source_sim_info: SimInfo, target: Any = None) -> Hashable:
+        if target is None:
+            target_key = None
+        else:
+            # Terrain points do not have a unique id, so fall back to the instance itself.
+            target_key = (type(target), getattr(target, 'id', None) or id(target))
+        return CommonSimUtils.get_sim_id(source_sim_info), target_key, self._generation
+
+    def _get_cached_availability(self, cache_key: Hashable) -> Union[bool, None]:
+        cached_entry = self._availability_cache.get(cache_key, None)
+        if cached_entry is None:
+            return None
+        (cached_tick, cached_time, cached_result) = cached_entry
+        if cached_tick != self._get_current_tick() or time.perf_counter() - cached_time > self._AVAILABILITY_CACHE_MAX_AGE:
+            del self._availability_cache[cache_key]
+            return None
+        self._availability_cache.move_to_end(cache_key)
+        return cached_result
+
+    def _set_cached_availability(self, cache_key: Hashable, result: bool):
+        self._availability_cache[cache_key] = (self._get_current_tick(), time.perf_counter(), result)
+        self._availability_cache.move_to_end(cache_key)
+        while len(self._availability_cache) > self._AVAILABILITY_CACHE_MAX_SIZE:
+            self._availability_cache.popitem(last=False)
+
+    @staticmethod
+    def _get_current_tick() -> int:
+        time_service = services.time_service()
+        if time_service is None or time_service.sim_timeline is None:
+            return -1
+        return time_service.sim_now.absolute_ticks()
+
+    def get_menu_item_statistics(self, menu_item: S4MSMMenuItem) -> Union[S4MSMMenuItemStatistics, None]:
+        """get_menu_item_statistics(menu_item)
+
+        Retrieve statistics about the availability tests of a registered menu item.
+
+        :param menu_item: An instance of a menu item.
+        :type menu_item: S4MSMMenuItem
+        :return: The statistics of the menu item or None if the menu item is not registered.
+        :rtype: Union[S4MSMMenuItemStatistics, None]
+        """
+        return self._menu_item_statistics.get(menu_item, None)
+
+    def get_all_menu_item_statistics(self) -> Tuple[Tuple[S4MSMMenuItem, S4MSMMenuItemStatistics]]:
+        """get_all_menu_item_statistics()
+
+        Retrieve the statistics of all registered menu items.
+
+        :return: A collection of registered menu items along with their statistics, sorted by the identifier of the menu items.
+        :rtype: Tuple[Tuple[S4MSMMenuItem, S4MSMMenuItemStatistics]]
+        """
+        return tuple((menu_item, self._menu_item_statistics[menu_item]) for menu_item in self._get_registered_menu_items())
+
+    def show_menu_item(
+        self,
+        menu_item: S4MSMMenuItem,
+        source_sim_info: SimInfo,
+        target: Any = None,
+        on_close: Callable[..., Any] = CommonFunctionUtils.noop
+    ) -> Any:
+        """show_menu_item(\
+            menu_item,\
+            source_sim_info,\
+            target=None,\
+            on_close=CommonFunctionUtils.noop\
+        )
+
+        Show the settings dialog of a menu item, recording how long it takes.
+
+        :param menu_item: An instance of a menu item.
+        :type menu_item: S4MSMMenuItem
+        :param source_sim_info: An instance of a Sim.
+        :type source_sim_info: SimInfo
+        :param target: An instance of an object. Default is None.
+        :type target: Any, optional
+        :param on_close: The action to take upon the settings being closed. Default is CommonFunctionUtils.noop.
+        :type on_close: Callable[..., Any], optional
+        :return: The result of showing the menu item.
+        :rtype: Any
+        """
+        start_time = time.perf_counter()
+        try:
+            return menu_item.show(source_sim_info, target=target, on_close=on_close)
+        finally:
+            menu_item_statistics = self._menu_item_statistics.get(menu_item, None)
+            if menu_item_statistics is not None:
+                menu_item_statistics.record_show(time.perf_counter() - start_time)
+
+    def get_quarantined_menu_items(self) -> Tuple[S4MSMMenuItem]:
+        """get_quarantined_menu_items()
+
+        Retrieve the menu items that are quarantined for being slow or failing their availability tests.
+
+        .. note:: A quarantined menu item is tested at most once per quarantine interval. In between, its last result is used.
+
+        :return: A collection of quarantined menu items.
+        :rtype: Tuple[S4MSMMenuItem]
+        """
+        return tuple(menu_item for menu_item in self._get_registered_menu_items() if self._menu_item_statistics[menu_item].is_quarantined)
+
+    def release_quarantined_menu_items(self, identifier: str = None) -> int:
+        """release_quarantined_menu_items(identifier=None)
+
+        Release menu items from quarantine, so they are tested every time again.
+
+        :param identifier: The identifier of the menu items to release. Default is None (Release all of them).
+        :type identifier: str, optional
+        :return: The number of menu items that were released.
+        :rtype: int
+        """
+        released_count = 0
+        for menu_item in self.get_quarantined_menu_items():
+            if identifier is not None and menu_item.identifier != identifier:
+                continue
+            menu_item_statistics = self._menu_item_statistics[menu_item]
+            menu_item_statistics.is_quarantined = False
+            menu_item_statistics.strike_count = 0
+            released_count += 1
+        if released_count > 0:
+            self._availability_cache.clear()
+        return released_count
+
+    def _is_menu_item_available_for(self, menu_item: S4MSMMenuItem, source_sim_info: SimInfo, target: Any = None, predicate_results: Dict[str, bool] = None) -> bool:
+        menu_item_statistics = self._menu_item_statistics.get(menu_item, None)
+        if menu_item_statistics is not None and menu_item_statistics.is_quarantined and time.perf_counter() < menu_item_statistics.quarantine_retest_time:
+            return menu_item_statistics.last_test_result
+        self._test_count += 1
+        start_time = time.perf_counter()
+        failed = False
+        try:
+            availability_predicate = menu_item.availability_predicate
+            if availability_predicate is not None:
+                is_available_for_result = availability_predicate.evaluate(source_sim_info, target=target, results=predicate_results)
+            else:
+                is_available_for_result = bool(menu_item.is_available_for(source_sim_info, target=target))
+        except Exception as ex:
+            self.log.error(f'Error occurred while checking if menu item \'{menu_item.identifier}\' is available.', exception=ex)
+            is_available_for_result = False
+            failed = True
+        test_time = time.perf_counter() - start_time
+        if menu_item_statistics is not None:
+            menu_item_statistics.record_test(is_available_for_result, test_time)
+            self._update_quarantine(menu_item, menu_item_statistics, failed or test_time > self._QUARANTINE_SLOW_TEST_TIME)
+        return is_available_for_result
+
+    def _update_quarantine(self, menu_item: S4MSMMenuItem, menu_item_statistics: S4MSMMenuItemStatistics, is_strike: bool):
+        if is_strike:
+            menu_item_statistics.strike_count = min(menu_item_statistics.strike_count + 1, self._QUARANTINE_STRIKE_LIMIT)
+        elif menu_item_statistics.strike_count > 0:
+            # Good results slowly clear strikes, so only menu items that are regularly slow stay quarantined.
+            menu_item_statistics.strike_count -= 1
+        if menu_item_statistics.strike_count >= self._QUARANTINE_STRIKE_LIMIT:
+            if not menu_item_statistics.is_quarantined:
+                self.log.warn(f'Menu item \'{menu_item.identifier}\' was slow or failed {self._QUARANTINE_STRIKE_LIMIT} times, it will be tested at most once every {self._QUARANTINE_RETEST_INTERVAL} seconds.')
+            menu_item_statistics.is_quarantined = True
+            menu_item_statistics.quarantine_retest_time = time.perf_counter() + self._QUARANTINE_RETEST_INTERVAL
+        else:
+            # Below the strike limit the menu item is tested normally, this also ends a quarantine once enough clean results clear its strikes.
+            menu_item_statistics.is_quarantined = False
+
+    def _get_menu_items_available_for_gen(self, source_sim_info: SimInfo, target: Any = None, order_by_expected_cost: bool = False) -> Iterator[S4MSMMenuItem]:
+        log = self.log
         menu_items_count = 0
-        for menu_item in self._registered_menu_items:
-            self.log.format_with_message(f'Checking if menu item \'{menu_item.identifier}\' is available for the Sim and Target.')
-            is_available_for_result = menu_item.is_available_for(source_sim_info, target=target)
-            if not is_available_for_result:
-                self.log.format_with_message('Menu Item is not Available.', menu_item=menu_item, is_available_for_result=is_available_for_result)
+        for (menu_item, is_available) in self._get_menu_item_availability_gen(source_sim_info, target=target, order_by_expected_cost=order_by_expected_cost):
+            if not is_available:
                 continue
             menu_items_count += 1
-            self.log.format_with_message('Menu Item is Available.', menu_item=menu_item)
             yield menu_item
-        self.log.format_with_message(f'Located {menu_items_count} menu item(s( that were available for Sim and Target.', sim=source_sim_info, target=target)
+        if log.enabled:
+            log.format_with_message(f'Located {menu_items_count} menu item(s) that were available for Sim and Target.', sim=source_sim_info, target=target)
+
+    def _get_menu_item_availability_gen(self, source_sim_info: SimInfo, target: Any = None, order_by_expected_cost: bool = False) -> Iterator[Tuple[S4MSMMenuItem, bool]]:
+        log = self.log
+        key = self._get_index_key(source_sim_info, target=target)
+        always_available_menu_items = self._iterate_menu_item_refs(self._always_available_menu_item_refs_by_type.get(key, tuple()))
+        if order_by_expected_cost:
+            # Menu items that are always available cost nothing, so they come first.
+            candidate_menu_items = self._iterate_menu_item_refs(self._get_cost_ordered_menu_item_refs(key))
+            menu_items = itertools.chain(
+                ((menu_item, True) for menu_item in always_available_menu_items),
+                ((menu_item, False) for menu_item in candidate_menu_items)
+            )
+        else:
+            candidate_menu_items = self._iterate_menu_item_refs(self._menu_item_refs_by_type.get(key, tuple()))
+            menu_items = heapq.merge(
+                ((menu_item, True) for menu_item in always_available_menu_items),
+                ((menu_item, False) for menu_item in candidate_menu_items),
+                key=lambda entry: entry[0].identifier
+            )
+        # Predicate results are shared between all menu items tested for this Sim and Target.
+        predicate_results: Dict[str, bool] = dict()
+        for (menu_item, is_always_available) in menu_items:
+            if is_always_available:
+                yield menu_item, True
+                continue
+            if log.enabled:
+                log.format_with_message(f'Checking if menu item \'{menu_item.identifier}\' is available for the Sim and Target.')
+            is_available_for_result = self._is_menu_item_available_for(menu_item, source_sim_info, target=target, predicate_results=predicate_results)
+            if not is_available_for_result:
+                if log.enabled:
+                    log.format_with_message('Menu Item is not Available.', menu_item=menu_item, is_available_for_result=is_available_for_result)
+                yield menu_item, False
+                continue
+            if log.enabled:
+                log.format_with_message('Menu Item is Available.', menu_item=menu_item)
+            yield menu_item, True
@@ -0,0 +1,47 @@
+import hashlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+
+# Bump when a change to the compiler alters the bytecode it produces for the same source.
+compile_cache_version = 1
+
+
+def get_cache_key(source_bytes, source_path, optimize, release, release_stripped_log_methods=()):
+    # The source path is part of the key, because it is embedded in the compiled code as its file name.
+    key = hashlib.sha256()
+    for part in (str(compile_cache_version), sys.version, importlib.util.MAGIC_NUMBER.hex(), str(optimize), str(release), ','.join(release_stripped_log_methods) if release else '', source_path):
+        key.update(part.encode('utf-8'))
+        key.update(b'\0')
+    key.update(source_bytes)
+    return key.hexdigest()
+
+
+def _get_cache_path(cache_folder, key):
+    return os.path.join(cache_folder, key[:2], '{}.marshal'.format(key))
+
+
+def load_cached_code(cache_folder, key):
+    try:
+        with io.open(_get_cache_path(cache_folder, key), 'rb') as cache_file:
+            return cache_file.read()
+    except OSError:
+        return None
+
+
+def store_cached_code(cache_folder, key, marshalled_code):
+    cache_path = _get_cache_path(cache_folder, key)
+    cache_directory = os.path.dirname(cache_path)
+    os.makedirs(cache_directory, exist_ok=True)
+    # Written to a temporary file first, so other builds sharing the cache never read a partial entry.
+    (file_descriptor, temporary_path) = tempfile.mkstemp(dir=cache_directory, suffix='.tmp')
+    try:
+        with io.open(file_descriptor, 'wb') as cache_file:
+            cache_file.write(marshalled_code)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
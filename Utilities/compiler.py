@@ -1,7 +1,19 @@
+import ast
+import functools
+import hashlib
+import importlib.util
+import json
+import marshal
+import multiprocessing
 import shutil
 import io
 import fnmatch
-from zipfile import PyZipFile
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from zipfile import PyZipFile, ZipInfo
+from Utilities.compile_cache import get_cache_key, load_cached_code, store_cached_code
 from Utilities.unpyc3 import decompile
 from settings import *
 
@@ -65,7 +77,274 @@ def extract_folder(ea_folder, gameplay_folder):
                 extract_subfolder(root, filename, ea_folder)
 
 
-def compile_module(mod_creator_name=None, root=None, mod_scripts_folder=None, mod_name=None, ignore_folders=None, include_folders=None):
+# Logging methods that only produce output while a log is enabled. Calls to these are removed from release builds.
+release_stripped_log_methods = ('debug', 'info', 'format', 'format_with_message', 'format_info', 'format_info_with_message', 'log_stack')
+
+
+def _is_log_expression(node):
+    # Matches "log", "self.log", "cls.log", "self.get_log()" and "cls.get_log()".
+    if isinstance(node, ast.Name):
+        return node.id == 'log'
+    if isinstance(node, ast.Attribute):
+        return node.attr == 'log'
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+        return node.func.attr == 'get_log'
+    return False
+
+
+def _is_debug_log_statement(node):
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return isinstance(func, ast.Attribute) and func.attr in release_stripped_log_methods and _is_log_expression(func.value)
+
+
+def _is_log_enabled_test(node):
+    return isinstance(node, ast.Attribute) and node.attr == 'enabled' and _is_log_expression(node.value)
+
+
+class _ReleaseLogStripper(ast.NodeTransformer):
+    def generic_visit(self, node):
+        super().generic_visit(node)
+        for field in ('body', 'orelse', 'finalbody'):
+            statements = getattr(node, field, None)
+            if not isinstance(statements, list) or not statements or not isinstance(statements[0], ast.stmt):
+                continue
+            statements = [statement for statement in statements if not self._is_removable(statement)]
+            if not statements and field == 'body' and not isinstance(node, ast.Module):
+                statements = [ast.Pass()]
+            elif not statements and field == 'finalbody' and isinstance(node, ast.Try) and not node.handlers:
+                # A try needs either handlers or a finally block.
+                statements = [ast.Pass()]
+            setattr(node, field, statements)
+        return node
+
+    @staticmethod
+    def _is_removable(statement):
+        if _is_debug_log_statement(statement):
+            return True
+        # "if log.enabled:" guards left with nothing to do.
+        if isinstance(statement, ast.If) and _is_log_enabled_test(statement.test) and not statement.orelse:
+            return all(isinstance(child, ast.Pass) for child in statement.body)
+        return False
+
+
+def get_module_files(pathname, basename=''):
+    """ Locate the .py files and their archive names in the same way PyZipFile.writepy does. """
+    module_files = list()
+    name = os.path.basename(os.path.normpath(pathname))
+    if os.path.isfile(os.path.join(pathname, '__init__.py')):
+        basename = '{}/{}'.format(basename, name) if basename else name
+        # writepy adds the package __init__ ahead of everything else.
+        module_files.append((os.path.join(pathname, '__init__.py'), '{}/__init__.pyc'.format(basename)))
+        for filename in sorted(os.listdir(pathname)):
+            path = os.path.join(pathname, filename)
+            if os.path.isdir(path):
+                if os.path.isfile(os.path.join(path, '__init__.py')):
+                    module_files.extend(get_module_files(path, basename=basename))
+            elif filename.endswith('.py') and filename != '__init__.py':
+                module_files.append((path, '{}/{}c'.format(basename, filename)))
+    else:
+        for filename in sorted(os.listdir(pathname)):
+            path = os.path.join(pathname, filename)
+            if os.path.isfile(path) and filename.endswith('.py'):
+                module_files.append((path, '{}c'.format(filename) if not basename else '{}/{}c'.format(basename, filename)))
+    return module_files
+
+
+# Zip entries of reproducible builds all carry this timestamp, the earliest one a zip file can hold.
+reproducible_date_time = (1980, 1, 1, 0, 0, 0)
+
+
+def _compile_source_code(source_bytes, source_path, optimize, release):
+    source = source_bytes
+    if release:
+        source = ast.fix_missing_locations(_ReleaseLogStripper().visit(ast.parse(source_bytes, filename=source_path)))
+    return marshal.dumps(compile(source, source_path, 'exec', dont_inherit=True, optimize=optimize))
+
+
+def compile_source(source_path, optimize=2, release=False, reproducible=False, cache_folder=None):
+    with io.open(source_path, 'rb') as source_file:
+        source_bytes = source_file.read()
+    if cache_folder is None:
+        marshalled_code = _compile_source_code(source_bytes, source_path, optimize, release)
+    else:
+        # Only the code is cached, the header depends on the source file and is built every time.
+        cache_key = get_cache_key(source_bytes, source_path, optimize, release, release_stripped_log_methods=release_stripped_log_methods)
+        marshalled_code = load_cached_code(cache_folder, cache_key)
+        if marshalled_code is None:
+            marshalled_code = _compile_source_code(source_bytes, source_path, optimize, release)
+            store_cached_code(cache_folder, cache_key, marshalled_code)
+    if reproducible:
+        # An unchecked hash based header (PEP 552), the archive holds no sources to check against.
+        header = struct.pack('<I', 0b01) + importlib.util.source_hash(source_bytes)
+    else:
+        source_stats = os.stat(source_path)
+        header = struct.pack('<III', 0, int(source_stats.st_mtime) & 0xFFFFFFFF, source_stats.st_size & 0xFFFFFFFF)
+    return importlib.util.MAGIC_NUMBER + header + marshalled_code
+
+
+def _is_main_process():
+    # Pool workers started with spawn (the default on Windows) import the main script again under their own name.
+    return multiprocessing.current_process().name == 'MainProcess'
+
+
+def compile_sources(source_paths, release=False, processes=None, reproducible=False, cache_folder=None):
+    # Compiled by a pool of processes, the results are returned in the same order as source_paths.
+    # Outside of the main process a pool would start workers of its own, so the sources are compiled here instead.
+    if processes == 1 or len(source_paths) < 2 or not _is_main_process():
+        return [compile_source(source_path, release=release, reproducible=reproducible, cache_folder=cache_folder) for source_path in source_paths]
+    worker_count = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        return list(executor.map(functools.partial(compile_source, release=release, reproducible=reproducible, cache_folder=cache_folder), source_paths, chunksize=max(1, len(source_paths) // (worker_count * 4))))
+
+
+def write_compiled_entry(zf, source_path, arcname, compiled_source, reproducible=False):
+    if reproducible:
+        zip_info = ZipInfo(arcname, date_time=reproducible_date_time)
+        zip_info.create_system = 0
+        zip_info.external_attr = 0o644 << 16
+    else:
+        zip_info = ZipInfo(arcname, date_time=time.localtime(os.stat(source_path).st_mtime)[:6])
+    zip_info.compress_type = zf.compression
+    zf.writestr(zip_info, compiled_source)
+
+
+def write_compiled_source(zf, source_path, arcname, release=False):
+    write_compiled_entry(zf, source_path, arcname, compile_source(source_path, release=release))
+
+
+def get_folders_module_files(folders, reproducible=False):
+    module_files = list()
+    for folder in folders:
+        module_files.extend(get_module_files(folder))
+    if reproducible:
+        # Sorted by name, so the archive does not depend on the order the folders were listed in.
+        module_files.sort(key=lambda module_file: module_file[1])
+    return module_files
+
+
+def write_module_folders(zf, folders, release=False, processes=None, reproducible=False, cache_folder=None):
+    # Every module is compiled up front, then written by this process alone in the order writepy would use.
+    module_files = get_folders_module_files(folders, reproducible=reproducible)
+    compiled_sources = compile_sources([source_path for (source_path, _) in module_files], release=release, processes=processes, reproducible=reproducible, cache_folder=cache_folder)
+    for ((source_path, arcname), compiled_source) in zip(module_files, compiled_sources):
+        write_compiled_entry(zf, source_path, arcname, compiled_source, reproducible=reproducible)
+    print('Compiled {} module(s).'.format(len(module_files)))
+
+
+def write_release_folder(zf, folder):
+    for (source_path, arcname) in get_module_files(folder):
+        write_compiled_source(zf, source_path, arcname, release=True)
+
+
+def get_manifest_path(ts4script):
+    return '{}.manifest.json'.format(ts4script)
+
+
+def _get_build_options(release, reproducible):
+    # A manifest written with different options describes a different archive.
+    return {'release': release, 'reproducible': reproducible, 'optimize': 2, 'magic': importlib.util.MAGIC_NUMBER.hex()}
+
+
+def _load_manifest(manifest_path):
+    try:
+        with io.open(manifest_path, 'r') as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _get_archive_signature(ts4script):
+    # Any other build that rewrites the archive changes its signature, which makes the manifest unusable.
+    try:
+        archive_stats = os.stat(ts4script)
+    except OSError:
+        return None
+    return {'mtime': archive_stats.st_mtime_ns, 'size': archive_stats.st_size}
+
+
+def _write_manifest(manifest_path, build_options, modules, ts4script):
+    with io.open(manifest_path, 'w') as manifest_file:
+        json.dump({'options': build_options, 'archive': _get_archive_signature(ts4script), 'modules': modules}, manifest_file, indent=1)
+
+
+def _is_manifest_usable(manifest, build_options, ts4script):
+    if manifest is None or manifest.get('options') != build_options:
+        return False
+    archive_signature = _get_archive_signature(ts4script)
+    return archive_signature is not None and manifest.get('archive') == archive_signature
+
+
+def _get_source_hash(source_path):
+    with io.open(source_path, 'rb') as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
+
+
+def _get_module_entry(source_path, previous_entry):
+    # Sources with the same mtime and size are not read at all. Otherwise the hash decides.
+    source_stats = os.stat(source_path)
+    if previous_entry is not None and previous_entry['mtime'] == source_stats.st_mtime_ns and previous_entry['size'] == source_stats.st_size:
+        return previous_entry, False
+    source_hash = _get_source_hash(source_path)
+    entry = {'mtime': source_stats.st_mtime_ns, 'size': source_stats.st_size, 'hash': source_hash}
+    return entry, previous_entry is None or previous_entry['hash'] != source_hash
+
+
+def write_incremental_archive(ts4script, folders, release=False, processes=None, reproducible=False, cache_folder=None):
+    manifest_path = get_manifest_path(ts4script)
+    build_options = _get_build_options(release, reproducible)
+    previous_manifest = _load_manifest(manifest_path)
+    previous_modules = dict()
+    previous_zf = None
+    if _is_manifest_usable(previous_manifest, build_options, ts4script):
+        previous_zf = PyZipFile(ts4script)
+        previous_names = set(previous_zf.namelist())
+        previous_modules = {arcname: entry for (arcname, entry) in previous_manifest['modules'].items() if arcname in previous_names}
+    else:
+        print('No usable manifest found, compiling every module.')
+
+    try:
+        module_files = get_folders_module_files(folders, reproducible=reproducible)
+        modules = dict()
+        changed_arcnames = set()
+        for (source_path, arcname) in module_files:
+            (modules[arcname], is_changed) = _get_module_entry(source_path, previous_modules.get(arcname))
+            if is_changed:
+                changed_arcnames.add(arcname)
+
+        if not changed_arcnames and list(modules) == list(previous_modules):
+            if modules != previous_modules:
+                _write_manifest(manifest_path, build_options, modules, ts4script)
+            print('No modules changed, \'{}\' is up to date.'.format(ts4script))
+            return False
+
+        changed_module_files = [(source_path, arcname) for (source_path, arcname) in module_files if arcname in changed_arcnames]
+        for (source_path, _) in changed_module_files:
+            print('Compiling \'{}\''.format(source_path))
+        compiled_sources = dict(zip(
+            [arcname for (_, arcname) in changed_module_files],
+            compile_sources([source_path for (source_path, _) in changed_module_files], release=release, processes=processes, reproducible=reproducible, cache_folder=cache_folder)
+        ))
+
+        # The new archive is written beside the old one, which stays intact if compiling fails.
+        temporary_ts4script = '{}.tmp'.format(ts4script)
+        with PyZipFile(temporary_ts4script, mode='w', allowZip64=True) as zf:
+            for (source_path, arcname) in module_files:
+                if arcname in compiled_sources:
+                    write_compiled_entry(zf, source_path, arcname, compiled_sources[arcname], reproducible=reproducible)
+                else:
+                    zf.writestr(previous_zf.getinfo(arcname), previous_zf.read(arcname))
+    finally:
+        if previous_zf is not None:
+            previous_zf.close()
+    os.replace(temporary_ts4script, ts4script)
+    _write_manifest(manifest_path, build_options, modules, ts4script)
+    print('Compiled {} of {} module(s).'.format(len(changed_arcnames), len(module_files)))
+    return True
+
+
+def get_ts4script_path(mod_creator_name=None, root=None, mod_name=None):
     if not mod_creator_name:
         mod_creator_name = creator_name
     if not mod_name:
@@ -81,19 +360,39 @@ def compile_module(mod_creator_name=None, root=None, mod_scripts_folder=None, mo
         ts4script = script_zip_name
     else:
         ts4script = os.path.join(root, script_zip_name)
+    return ts4script
+
+
+# With parallel=True, the modules are compiled by a pool of processes. On Windows, each of them imports the
+# calling script again, so scripts that pass parallel=True must only call compile_module under
+# "if __name__ == '__main__':". Calls made while a worker imports the script are ignored.
+def compile_module(mod_creator_name=None, root=None, mod_scripts_folder=None, mod_name=None, ignore_folders=None, include_folders=None, release=False, incremental=False, parallel=False, processes=None, reproducible=False, cache_folder=None):
+    if not _is_main_process():
+        # A pool worker importing the calling script again, building here would rewrite the archive being written.
+        return None
+    ts4script = get_ts4script_path(mod_creator_name=mod_creator_name, root=root, mod_name=mod_name)
 
+    if incremental:
+        return compile_module_incremental(ts4script, mod_scripts_folder, ignore_folders=ignore_folders, include_folders=include_folders, release=release, processes=processes if parallel else 1, reproducible=reproducible, cache_folder=cache_folder)
+
+    zf = None
+    previous_working_directory = os.getcwd()
     try:
         if os.path.exists(ts4script):
             print('Script archive found, removing found archive.')
             os.remove(ts4script)
             print('Script archive removed.')
+        manifest_path = get_manifest_path(ts4script)
+        if os.path.exists(manifest_path):
+            # The manifest of an incremental build no longer describes the archive written here.
+            os.remove(manifest_path)
         zf = PyZipFile(ts4script, mode='w', allowZip64=True, optimize=2)
         child_directories = get_child_directories(mod_scripts_folder)
-        previous_working_directory = os.getcwd()
         print('Changing the working directory to \'{}\''.format(mod_scripts_folder))
         os.chdir(mod_scripts_folder)
         print('Changed the current working directory \'{}\'.'.format(os.getcwd()))
         # print('Found child directories {}'.format(pformat(tuple(child_directories))))
+        collected_folders = list()
         for folder in child_directories:
             # print('Attempting to compile {}'.format(folder))
             if ignore_folders is not None and os.path.basename(folder) in ignore_folders:
@@ -102,24 +401,165 @@ def compile_module(mod_creator_name=None, root=None, mod_scripts_folder=None, mo
             if include_folders is not None and os.path.basename(folder) not in include_folders:
                 # print('Folder is not set to be included. Continuing to the next folder.')
                 continue
+            if parallel or reproducible or cache_folder is not None:
+                # Written together once every folder is known.
+                collected_folders.append(folder)
+                continue
             try:
                 print('Compiling folder \'{}\''.format(folder))
-                zf.writepy(folder)
+                if release:
+                    # Release builds ship without debug logging.
+                    write_release_folder(zf, folder)
+                else:
+                    zf.writepy(folder)
                 print('\'{}\' compiled successfully.'.format(folder))
             except Exception as ex:
-                print('Failed to write {}. {}'.format(folder, ex.args[1]))
+                print('Failed to write {}. {}'.format(folder, ex))
                 continue
+        if collected_folders:
+            try:
+                print('Compiling folders {}'.format(', '.join('\'{}\''.format(folder) for folder in collected_folders)))
+                write_module_folders(zf, collected_folders, release=release, processes=processes if parallel else 1, reproducible=reproducible, cache_folder=cache_folder)
+            except Exception as ex:
+                print('Failed to write {}. {}'.format(', '.join(collected_folders), ex))
+                # The folders are written together, an archive without them is not worth keeping.
+                raise
         print('Done compiling files.')
         zf.close()
         print('Changing working directory to previous working directory.')
         os.chdir(previous_working_directory)
         print('Changed the current working directory to \'{}\''.format(os.getcwd()))
     except Exception as ex:
-        print('Failed to create {}. {}'.format(ts4script, ex.args[1]))
+        print('Failed to create {}. {}'.format(ts4script, ex))
+        os.chdir(previous_working_directory)
+        if zf is not None:
+            zf.close()
+            os.remove(ts4script)
         return
 
-    # ts4script_mods = os.path.join(os.path.join(mods_folder), script_zip_name)
-    # shutil.copyfile(ts4script, ts4script_mods)
+    # deploy_ts4script(ts4script)
+
+
+def compile_module_incremental(ts4script, mod_scripts_folder, ignore_folders=None, include_folders=None, release=False, processes=1, reproducible=False, cache_folder=None):
+    # Only the modules whose source changed since the last build are compiled, the rest are copied from the previous archive.
+    ts4script = os.path.abspath(ts4script)
+    previous_working_directory = os.getcwd()
+    print('Changing the working directory to \'{}\''.format(mod_scripts_folder))
+    os.chdir(mod_scripts_folder)
+    try:
+        folders = get_included_folders('.', ignore_folders=ignore_folders, include_folders=include_folders)
+        return write_incremental_archive(ts4script, folders, release=release, processes=processes, reproducible=reproducible, cache_folder=cache_folder)
+    except Exception as ex:
+        print('Failed to create {}. {}'.format(ts4script, ex))
+        return False
+    finally:
+        os.chdir(previous_working_directory)
+        print('Changed the current working directory to \'{}\''.format(os.getcwd()))
+
+
+def get_included_folders(mod_scripts_folder, ignore_folders=None, include_folders=None):
+    folders = list()
+    for folder in sorted(os.listdir(mod_scripts_folder)):
+        if not os.path.isdir(os.path.join(mod_scripts_folder, folder)):
+            continue
+        if ignore_folders is not None and folder in ignore_folders:
+            continue
+        if include_folders is not None and folder not in include_folders:
+            continue
+        folders.append(folder)
+    return folders
+
+
+def _get_source_snapshot(mod_scripts_folder, folders):
+    snapshot = dict()
+    for folder in folders:
+        for (root, _, files) in os.walk(os.path.join(mod_scripts_folder, folder)):
+            for filename in files:
+                if filename.endswith('.py'):
+                    path = os.path.join(root, filename)
+                    try:
+                        source_stats = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (source_stats.st_mtime_ns, source_stats.st_size)
+    return snapshot
+
+
+def _start_source_observer(mod_scripts_folder, folders, sources_changed):
+    # Filesystem notifications are used when watchdog is installed, otherwise the sources are polled.
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class _SourceEventHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            paths = (getattr(event, 'src_path', ''), getattr(event, 'dest_path', ''))
+            if event.is_directory or any(path.endswith('.py') for path in paths):
+                sources_changed.set()
+
+    observer = Observer()
+    for folder in folders:
+        observer.schedule(_SourceEventHandler(), os.path.join(mod_scripts_folder, folder), recursive=True)
+    observer.start()
+    return observer
+
+
+def deploy_ts4script(ts4script, destination_folder=None):
+    if not destination_folder:
+        destination_folder = mods_folder
+    destination = os.path.join(destination_folder, os.path.basename(ts4script))
+    # Copied beside the destination first, so the game never sees a partially copied archive.
+    temporary_destination = '{}.tmp'.format(destination)
+    shutil.copyfile(ts4script, temporary_destination)
+    os.replace(temporary_destination, destination)
+    return destination
+
+
+def watch_module(mod_creator_name=None, root=None, mod_scripts_folder=None, mod_name=None, ignore_folders=None, include_folders=None, release=False, reproducible=False, cache_folder=None, destination_folder=None, poll_interval=0.2, settle_time=0.05):
+    if not _is_main_process():
+        return
+    ts4script = os.path.abspath(get_ts4script_path(mod_creator_name=mod_creator_name, root=root, mod_name=mod_name))
+    mod_scripts_folder = os.path.abspath(mod_scripts_folder)
+    folders = get_included_folders(mod_scripts_folder, ignore_folders=ignore_folders, include_folders=include_folders)
+
+    def _build_and_deploy(always_deploy=False):
+        if not compile_module_incremental(ts4script, mod_scripts_folder, ignore_folders=ignore_folders, include_folders=include_folders, release=release, reproducible=reproducible, cache_folder=cache_folder) and not always_deploy:
+            return
+        try:
+            print('Deployed \'{}\'.'.format(deploy_ts4script(ts4script, destination_folder=destination_folder)))
+        except OSError as ex:
+            print('Failed to deploy {}. {}'.format(ts4script, ex))
+
+    _build_and_deploy(always_deploy=True)
+    sources_changed = threading.Event()
+    observer = _start_source_observer(mod_scripts_folder, folders, sources_changed)
+    snapshot = _get_source_snapshot(mod_scripts_folder, folders)
+    print('Watching {} for changes{}. Press Ctrl+C to stop.'.format(', '.join('\'{}\''.format(folder) for folder in folders), '' if observer is not None else ', polling every {} seconds'.format(poll_interval)))
+    try:
+        while True:
+            if observer is not None:
+                if not sources_changed.wait(timeout=1.0):
+                    continue
+                # Editors often save in several steps, wait for them to finish.
+                time.sleep(settle_time)
+                sources_changed.clear()
+            else:
+                time.sleep(poll_interval)
+                current_snapshot = _get_source_snapshot(mod_scripts_folder, folders)
+                if current_snapshot == snapshot:
+                    continue
+                snapshot = current_snapshot
+            started_time = time.perf_counter()
+            _build_and_deploy()
+            print('Rebuilt in {} ms.'.format(round((time.perf_counter() - started_time) * 1000)))
+    except KeyboardInterrupt:
+        print('Stopped watching.')
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
 
 
 def get_child_directories(d):
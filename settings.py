@@ -15,3 +15,6 @@ if include_ea_decompile:
 
 decompile_src = './decompiled'
 decompile_destination = './decompiled'
+
+# Compiled bytecode shared by every compile_module run and mod package, keyed by the source contents.
+compile_cache_folder = os.path.expanduser(os.path.join('~', '.ts4script_cache'))